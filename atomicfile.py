@@ -0,0 +1,29 @@
+"""
+Atomic file writes: the data goes to PATH.tmp next to the target, which
+os.replace then swaps in, so a reader (or the next run after a crash) sees
+either the old file or the new one, never half of one. The caches, indexes
+and state files the pipeline keeps are all saved this way.
+
+    with atomic_open(path) as f:
+        json.dump(data, f)
+"""
+import os
+import contextlib
+
+@contextlib.contextmanager
+def atomic_open(path: str, mode: str = "w"):
+    """A file opened for writing in place of path; path is replaced only if the block completes."""
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, mode) as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
+def write_atomic(path: str, data):
+    """Replace path's contents with data (bytes or str)."""
+    with atomic_open(path, "wb" if isinstance(data, bytes) else "w") as f:
+        f.write(data)
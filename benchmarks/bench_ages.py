@@ -0,0 +1,51 @@
+"""
+Age computation: per-listing datetime.fromtimestamp/timedelta (once for
+stale-marking, again for every rendered row) against one batched
+computeAges() whose result both steps reuse.
+
+    python -m benchmarks.bench_ages [--scale N]
+"""
+import argparse
+from datetime import datetime
+
+import util
+from benchmarks.common import load_listings, best_of
+
+def per_listing(listings, now):
+    # What mark_stale_listings + create_md_table used to do
+    for listing in listings:
+        age_in_months = (now - datetime.fromtimestamp(listing["date_posted"])).days / 30
+        if age_in_months >= util.SIMPLIFY_INACTIVE_THRESHOLD_MONTHS:
+            listing["active"] = False
+    return [max((now - datetime.fromtimestamp(l["date_posted"])).days, 0) for l in listings]
+
+def batched(listings, now):
+    util.mark_stale_listings(listings, now)
+    return [util.getDaysActive(l, now) for l in listings]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--listings", default="listings.json")
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    listings = load_listings(args.listings, args.scale)
+    now = datetime.now()
+    before_s, expected = best_of(lambda: per_listing(listings, now))
+    after_s, actual = best_of(lambda: batched(listings, now))
+    if actual != expected:
+        raise SystemExit("batched ages differ from datetime arithmetic")
+
+    numpy, util.np = util.np, None
+    pure_s, _ = best_of(lambda: batched(listings, now))
+    util.np = numpy
+
+    n = len(listings)
+    print(f"{n:,} listings, ages identical")
+    print(f"{'per-listing datetime':<24}{before_s * 1000:>9.1f} ms")
+    print(f"{'batched, pure Python':<24}{pure_s * 1000:>9.1f} ms  ({before_s / pure_s:.1f}x)")
+    if numpy is not None:
+        print(f"{'batched, NumPy':<24}{after_s * 1000:>9.1f} ms  ({before_s / after_s:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+URL canonicalization throughput on the bundled listings, and how many
+postings the hashed dedupe finds that dedupe on the raw URL string misses.
+Also times saving and loading a UrlHashSet.
+
+    python -m benchmarks.bench_canonical [--scale N]
+"""
+import os
+import argparse
+import tempfile
+
+from canonical_url import canonical_url, posting_key, url_hash, UrlHashSet
+from benchmarks.common import load_listings, best_of
+
+def raw_dedupe(urls):
+    seen = set()
+    return [u for u in urls if not (u in seen or seen.add(u))]
+
+def hashed_dedupe(urls):
+    seen = UrlHashSet()
+    return [u for u in urls if seen.add(u)]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--listings", default="listings.json")
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    urls = [l["url"].strip() for l in load_listings(args.listings, args.scale)]
+    print(f"{len(urls):,} URLs")
+    for label, fn in (("canonical_url", canonical_url), ("posting_key", posting_key), ("url_hash", url_hash)):
+        seconds, _ = best_of(lambda: [fn(u) for u in urls])
+        print(f"{label:<20}{seconds * 1000:>9.1f} ms {len(urls) / seconds:>12,.0f} URLs/s")
+
+    raw_s, raw = best_of(lambda: raw_dedupe(urls))
+    hashed_s, hashed = best_of(lambda: hashed_dedupe(urls))
+    print(f"{'raw string dedupe':<20}{raw_s * 1000:>9.1f} ms {len(raw):>12,} unique")
+    print(f"{'hashed dedupe':<20}{hashed_s * 1000:>9.1f} ms {len(hashed):>12,} unique "
+          f"({len(raw) - len(hashed)} repeat postings found)")
+
+    seen = UrlHashSet()
+    for u in urls:
+        seen.add(u)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "urls.bin")
+        save_s, _ = best_of(lambda: seen.save(path))
+        load_s, loaded = best_of(lambda: UrlHashSet.load(path))
+        assert loaded.hashes == seen.hashes
+        print(f"{'save / load':<20}{save_s * 1000:>9.1f} ms / {load_s * 1000:.1f} ms, "
+              f"{os.path.getsize(path):,} bytes on disk")
+
+if __name__ == "__main__":
+    main()
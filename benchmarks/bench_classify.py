@@ -0,0 +1,55 @@
+"""
+Titles/sec for classifyJobCategory before and after the compiled matcher.
+
+    python -m benchmarks.bench_classify [listings.json]
+"""
+import sys
+import time
+import random
+
+import util
+from benchmarks import legacy
+
+def random_titles(n, seed=0):
+    """Titles stitched together from keywords, to exercise overlaps and priority."""
+    rng = random.Random(seed)
+    words = list(util.IT_SUPPORT_TERMS) + util.PRODUCT_QUALIFIERS + ["product", "intern", "summer", "2026", "-", "&"]
+    for _, terms in util.CATEGORY_TERMS:
+        words += terms
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(1, 5))) for _ in range(n)]
+
+def rate(fn, jobs, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for job in jobs:
+            fn(job)
+        best = min(best, time.perf_counter() - start)
+    return len(jobs) / best
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else "listings.json"
+    jobs = util.getListingsFromJSON(path)
+    fuzz = [{"title": t} for t in random_titles(20000)]
+
+    mismatches = [
+        job["title"] for job in jobs + fuzz
+        if legacy.classifyJobCategory(job) != util.classifyJobCategory(job)
+    ]
+    if mismatches:
+        sys.exit(f"{len(mismatches)} titles classified differently, e.g. {mismatches[:5]}")
+    print(f"identical results on {len(jobs)} listings + {len(fuzz)} generated titles")
+
+    uncached = lambda job: util.classifyTitle.__wrapped__(job.get("title", "").lower())
+    before = rate(legacy.classifyJobCategory, jobs)
+    after = rate(uncached, jobs)
+    util.classifyTitle.cache_clear()
+    cold = rate(util.classifyJobCategory, jobs, repeat=1)
+    warm = rate(util.classifyJobCategory, jobs)
+    print(f"{'legacy any() scans':<28}{before:>12,.0f} titles/s")
+    print(f"{'compiled matcher':<28}{after:>12,.0f} titles/s  ({after / before:.1f}x)")
+    print(f"{'compiled + memo (cold)':<28}{cold:>12,.0f} titles/s  ({cold / before:.1f}x)")
+    print(f"{'compiled + memo (warm)':<28}{warm:>12,.0f} titles/s  ({warm / before:.1f}x)")
+
+if __name__ == "__main__":
+    main()
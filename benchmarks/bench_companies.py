@@ -0,0 +1,68 @@
+"""
+sortListings followed by one table per (category, active/inactive) group:
+the legacy code, the current renderer building company cells per table, and
+with a shared util.CompanyIndex. The index is built once by sortListings
+and its company cells are shared by every table of the render. Checks the
+sorted order, the rewritten company URLs and the tables are identical to
+benchmarks/legacy.py.
+
+    python -m benchmarks.bench_companies [--scale N]
+"""
+import sys
+import argparse
+from datetime import datetime
+
+import util
+from benchmarks import legacy
+from benchmarks.common import load_listings, FrozenDatetime, best_of
+
+NOW = datetime(2025, 10, 1, 12, 0, 0)
+
+def groups(listings):
+    # Stand-in for CategoryIndex: split by a field the bundled listings always have
+    split = {}
+    for listing in listings:
+        split.setdefault((listing["terms"][0], listing["active"]), []).append(listing)
+    return [rows for _, rows in sorted(split.items())]
+
+def before(listings):
+    listings = legacy.sortListings([dict(l) for l in listings])
+    return listings, [legacy.create_md_table(rows) for rows in groups(listings)]
+
+def per_table(listings):
+    listings = util.sortListings([dict(l) for l in listings])
+    return listings, [util.create_md_table(rows, now=NOW) for rows in groups(listings)]
+
+def after(listings):
+    listings = [dict(l) for l in listings]
+    companies = util.CompanyIndex.build(listings)
+    util.sortListings(listings, companies)
+    return listings, [util.create_md_table(rows, now=NOW, companies=companies) for rows in groups(listings)]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--listings", default="listings.json")
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    listings = load_listings(args.listings, args.scale)
+    FrozenDatetime.frozen = NOW
+    legacy.datetime = FrozenDatetime
+
+    before_s, expected = best_of(lambda: before(listings))
+    per_table_s, _ = best_of(lambda: per_table(listings))
+    after_s, actual = best_of(lambda: after(listings))
+    if [(l["id"], l["company_url"]) for l in actual[0]] != [(l["id"], l["company_url"]) for l in expected[0]]:
+        sys.exit("sortListings order or company URLs differ from the previous implementation")
+    if actual[1] != expected[1]:
+        sys.exit("tables differ from the previous implementation")
+
+    companies = util.CompanyIndex.build(listings)
+    print(f"identical order and {len(actual[1])} tables for {len(listings)} listings, "
+          f"{len(companies.companies)} companies")
+    print(f"{'legacy':<24}{before_s * 1000:>9.1f} ms")
+    print(f"{'cells per table':<24}{per_table_s * 1000:>9.1f} ms  ({before_s / per_table_s:.1f}x)")
+    print(f"{'company index':<24}{after_s * 1000:>9.1f} ms  ({before_s / after_s:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Memory and throughput of ListingTable against the list-of-dicts path for
+mark_stale_listings, filter_active, filterSummer and sortListings.
+
+    python -m benchmarks.bench_listing_table [--scale N]
+"""
+import json
+import argparse
+import tracemalloc
+from datetime import datetime
+
+import util
+import listing_table
+from listing_table import ListingTable
+from benchmarks.common import load_listings, best_of
+
+def retained_bytes(build):
+    """Memory still allocated by build() once it returns (temporaries freed)."""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--listings", default="listings.json")
+    parser.add_argument("--scale", type=int, default=10)
+    args = parser.parse_args()
+
+    source = json.dumps(load_listings(args.listings, args.scale))
+    dict_bytes, listings = retained_bytes(lambda: json.loads(source))
+    table_bytes, table = retained_bytes(lambda: ListingTable.fromListings(json.loads(source)))
+
+    n = len(listings)
+    print(f"{n:,} listings, numpy={'yes' if listing_table.np else 'no'}")
+    print(f"{'memory':<22}{dict_bytes / 2**20:>10.1f} MiB dicts {table_bytes / 2**20:>10.1f} MiB table")
+
+    now = datetime.now()
+    stages = [
+        ("mark_stale_listings", lambda l: util.mark_stale_listings(l, now), lambda t: t.mark_stale_listings(now)),
+        ("filter_active", util.filter_active, lambda t: t.filter_active()),
+        ("filterSummer", lambda l: util.filterSummer(l, "2026", 0), lambda t: t.filterSummer("2026", 0)),
+        ("sortListings", lambda l: util.sortListings(list(l)), lambda t: t.sortListings()),
+    ]
+    for name, on_dicts, on_table in stages:
+        dict_s, _ = best_of(lambda: on_dicts(listings))
+        table_s, _ = best_of(lambda: on_table(table))
+        print(f"{name:<22}{dict_s * 1000:>10.1f} ms dicts {table_s * 1000:>10.1f} ms table  ({dict_s / table_s:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Bulk Notion upserts against the local mock server: write_to_notion's
+thread pool against notion_async's pooled asyncio engine, for a create pass
+and an update pass over the same jobs. Checks both leave exactly one page
+per URL.
+
+    python -m benchmarks.bench_notion [--jobs N] [--concurrency N] [--latency S] [--rate-limit P]
+                                      [--lookup index|property]
+"""
+import os
+import io
+import asyncio
+import argparse
+import tempfile
+import contextlib
+from collections import Counter
+
+os.environ.setdefault("NOTION_TOKEN", "secret_benchmark")
+os.environ.setdefault("NOTION_DB_ID", "benchmark-db")
+
+import write_to_notion
+import notion_async
+from notion_client import Client
+from benchmarks.common import load_listings
+from benchmarks.mock_notion import MockNotion
+
+def check_pages(mock, jobs):
+    urls = Counter(p["properties"]["Name"]["title"][0]["text"]["link"]["url"] for p in mock.pages.values())
+    assert set(urls) == {url for _, url, _ in jobs} and max(urls.values()) == 1, urls.most_common(3)
+
+def threaded(mock, jobs, index_path, concurrency):
+    write_to_notion.notion = Client(auth="secret_benchmark", base_url=mock.url)
+    write_to_notion.NOTION_DB_ID = "benchmark-db"
+    write_to_notion._index = write_to_notion.PageIndex(index_path)
+    write_to_notion._index.reconcile("benchmark-db")
+    return write_to_notion.upsert_jobs(jobs, workers=concurrency, rate=1e9)[1]
+
+def pooled(mock, jobs, index_path, concurrency):
+    return asyncio.run(notion_async.upsert_jobs(
+        jobs, concurrency, rate=1e9, db_id="benchmark-db", base_url=mock.url, index_path=index_path,
+        lookup=write_to_notion.LOOKUP))[1]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--listings", default="listings.json")
+    parser.add_argument("--jobs", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock latency per request (s)")
+    parser.add_argument("--rate-limit", type=float, default=0.02, help="Fraction of requests answered with 429")
+    parser.add_argument("--lookup", choices=("index", "property"), default="index")
+    args = parser.parse_args()
+    write_to_notion.LOOKUP = args.lookup
+
+    jobs = [(l["company_name"], write_to_notion._normalize_url(l["url"]), l["title"])
+            for l in load_listings(args.listings)[:args.jobs]]
+    print(f"{len(jobs)} jobs, concurrency {args.concurrency}, latency {args.latency * 1000:.0f} ms, "
+          f"{args.rate_limit:.0%} 429s, {args.lookup} lookup")
+    with tempfile.TemporaryDirectory() as workdir:
+        for label, engine in (("threads", threaded), ("asyncio pool", pooled)):
+            index_path = os.path.join(workdir, f"{label}.json")
+            with MockNotion(latency=args.latency, rate_limit=args.rate_limit) as mock:
+                for phase in ("create", "update"):
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        stats = engine(mock, jobs, index_path, args.concurrency)
+                    check_pages(mock, jobs)
+                    print(f"{label:<14}{phase:<8}{stats['elapsed_s']:>8.2f} s {stats['jobs_per_s']:>8.1f} jobs/s "
+                          f"p95 {stats['latency_p95_s'] * 1000:>6.0f} ms  {stats['retries']} retries, "
+                          f"{stats['failed']} failed")
+
+if __name__ == "__main__":
+    main()
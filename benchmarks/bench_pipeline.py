@@ -0,0 +1,219 @@
+"""
+End-to-end pipeline benchmark: fetch (streaming parse of a raw listings
+file), dedupe_by_url, ensureCategories, mark_stale_listings, sortListings,
+embedTable against a template README, and Notion upserts against the local
+mock server, at 1x, 10x and 100x the bundled listings.
+
+Each stage reports its best wall time over --repeat runs, then one more run
+under tracemalloc for peak traced memory and the number of memory blocks
+still allocated when it returns (its result included). Results are written as JSON; --compare flags any stage whose
+time or peak memory grew by more than --threshold against an earlier file
+and exits non-zero.
+
+    python -m benchmarks.bench_pipeline [--scales 1,10,100] [--output FILE]
+                                        [--compare OLD.json [--threshold 0.25]]
+"""
+import io
+import os
+import sys
+import json
+import copy
+import time
+import random
+import argparse
+import platform
+import tempfile
+import importlib.util
+import tracemalloc
+import contextlib
+import subprocess
+from datetime import datetime
+
+import util
+import scraper
+from jsonstream import iter_file, dump_array
+from benchmarks.common import load_listings, FrozenDatetime
+from benchmarks.mock_notion import MockNotion
+
+NOW = datetime(2025, 10, 1, 12, 0, 0)
+
+TEMPLATE = """# Summer 2026 Tech Internships by Pitt CSC & Simplify
+
+### Browse 0 Internship Roles by Category
+
+---
+
+<!-- TABLE_START -->
+<!-- TABLE_END -->
+"""
+
+def measure(stage, fn, setup=lambda: None, repeat=3):
+    """Best time over repeat runs of fn(setup()), then one traced run for memory."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        arg = setup()
+        start = time.perf_counter()
+        result = fn(arg)
+        best = min(best, time.perf_counter() - start)
+
+    arg = setup()
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    try:
+        traced = fn(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    retained = sys.getallocatedblocks() - blocks
+    del traced, arg
+
+    stats = {"time_s": round(best, 6), "peak_kib": round(peak / 1024, 1), "retained_blocks": retained}
+    print(f"  {stage:<22}{best * 1000:>10.1f} ms {stats['peak_kib']:>12,.0f} KiB peak {retained:>10,} blocks")
+    return stats, result
+
+def quiet(fn):
+    def run(arg):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn(arg)
+    return run
+
+def sync_stage(jobs, workdir, latency, rate_limit, workers):
+    """Upsert jobs twice through write_to_notion (creates, then updates) against a mock server."""
+    os.environ.setdefault("NOTION_TOKEN", "secret_benchmark")
+    os.environ.setdefault("NOTION_DB_ID", "benchmark-db")
+    import write_to_notion
+    from notion_client import Client
+
+    with MockNotion(latency=latency, rate_limit=rate_limit) as mock:
+        write_to_notion.notion = Client(auth="secret_benchmark", base_url=mock.url)
+        write_to_notion.NOTION_DB_ID = "benchmark-db"
+        write_to_notion.MAX_RETRIES = 10
+
+        def run(_):
+            write_to_notion._index = write_to_notion.PageIndex(os.path.join(workdir, "notion_index.json"))
+            write_to_notion._index.reconcile("benchmark-db")
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, stats = write_to_notion.upsert_jobs(jobs, workers=workers, rate=1e9)
+            return stats
+
+        def setup():
+            mock.pages.clear()
+            index_path = os.path.join(workdir, "notion_index.json")
+            if os.path.exists(index_path):
+                os.remove(index_path)
+
+        created, stats = measure("sync (create)", run, setup, repeat=1)
+        created.update(failed=stats["failed"], retries=stats["retries"])
+        updated, stats = measure("sync (update)", run, repeat=1)
+        updated.update(failed=stats["failed"], retries=stats["retries"])
+        print(f"  mock requests: {dict(mock.requests)}")
+    return created, updated
+
+def run_scale(scale, args, workdir):
+    print(f"{scale}x")
+    listings = load_listings(args.listings, scale)
+    rng = random.Random(scale)
+    # Upstream occasionally lists a URL twice; give dedupe something to do
+    raw = listings + [listings[rng.randrange(len(listings))] for _ in range(len(listings) // 20)]
+    raw_path = os.path.join(workdir, f"raw-{scale}.json")
+    with open(raw_path, "w") as f:
+        dump_array(raw, f)
+    del raw
+
+    results = {"rows": len(listings)}
+    results["fetch"], parsed = measure("fetch", lambda _: list(iter_file(raw_path)), repeat=args.repeat)
+    results["dedupe_by_url"], deduped = measure("dedupe_by_url", scraper.dedupe_by_url, lambda: parsed, args.repeat)
+
+    fresh = lambda: copy.deepcopy(listings)
+    def cold():
+        util.classifyTitle.cache_clear()  # time classification, not cache lookups
+        return fresh()
+    results["ensureCategories"], _ = measure("ensureCategories", quiet(util.ensureCategories), cold, args.repeat)
+    results["mark_stale_listings"], _ = measure(
+        "mark_stale_listings", lambda l: util.mark_stale_listings(l, NOW), fresh, args.repeat)
+    results["sortListings"], _ = measure("sortListings", util.sortListings, fresh, args.repeat)
+
+    readme = os.path.join(workdir, "README.md")
+    def readme_setup():
+        with open(readme, "w") as f:
+            f.write(TEMPLATE)
+        return fresh()
+    results["embedTable"], _ = measure(
+        "embedTable", quiet(lambda l: util.embedTable(l, readme)), readme_setup, args.repeat)
+
+    if args.sync_jobs:
+        if importlib.util.find_spec("notion_client") is None:
+            print("  sync skipped: notion-client is not installed")
+        else:
+            jobs = [(r["company_name"], r["url"], r["title"]) for r in deduped[:args.sync_jobs]]
+            results["sync_create"], results["sync_update"] = sync_stage(
+                jobs, workdir, args.latency, args.rate_limit, args.workers)
+    return results
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(old, new, threshold):
+    """Print per-stage ratios against an earlier result file; return the regressions."""
+    regressions = []
+    print(f"\ncompared with {old['meta'].get('commit')} ({old['meta'].get('date')}), threshold +{threshold:.0%}")
+    for scale, stages in new["scales"].items():
+        for stage, stats in stages.items():
+            before = old["scales"].get(scale, {}).get(stage)
+            if not isinstance(stats, dict) or not isinstance(before, dict):
+                continue
+            for metric in ("time_s", "peak_kib"):
+                if not before.get(metric):
+                    continue
+                ratio = stats[metric] / before[metric]
+                flag = ""
+                if ratio > 1 + threshold:
+                    flag = "  REGRESSION"
+                    regressions.append((scale, stage, metric, ratio))
+                print(f"  {scale:>5} {stage:<22}{metric:<10}{before[metric]:>12,.3f} -> {stats[metric]:>12,.3f}  {ratio:5.2f}x{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--listings", default="listings.json")
+    parser.add_argument("--scales", default="1,10,100", help="Comma-separated multiples of the bundled listings")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--sync-jobs", type=int, default=200, help="Jobs upserted per scale; 0 skips the sync stage")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.005, help="Mock Notion latency per request (s)")
+    parser.add_argument("--rate-limit", type=float, default=0.02, help="Fraction of mock requests answered with 429")
+    parser.add_argument("--output", default="benchmarks/results.json")
+    parser.add_argument("--compare", help="Earlier results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed growth before a stage is flagged")
+    args = parser.parse_args()
+
+    FrozenDatetime.frozen = NOW
+    util.datetime = FrozenDatetime  # fixed ages, so every run renders the same README
+
+    results = {
+        "meta": {"date": datetime.now().isoformat(timespec="seconds"), "commit": git_commit(),
+                 "python": platform.python_version(), "platform": platform.platform(),
+                 "cpus": os.cpu_count(), "args": vars(args)},
+        "scales": {},
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for scale in (int(s) for s in args.scales.split(",")):
+            results["scales"][f"{scale}x"] = run_scale(scale, args, workdir)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), results, args.threshold)
+        if regressions:
+            sys.exit(f"{len(regressions)} regression(s) over +{args.threshold:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+create_md_table before and after the list-buffer renderer. Checks the output
+is byte-identical to the previous implementation (benchmarks/legacy.py) and
+that embedTable still renders the bundled listings into exactly the committed
+golden README (benchmarks/golden/README.md.gz, dated NOW), then reports
+rows/sec. A mismatch with either exits non-zero.
+
+After a deliberate change to the README's output, rewrite the golden file
+with --update and commit it alongside the change. The golden check only
+applies to the bundled listings at --scale 1 and is skipped otherwise.
+
+    python -m benchmarks.bench_render [--scale N] [--update]
+"""
+import os
+import sys
+import gzip
+import argparse
+import tempfile
+import contextlib
+
+import util
+from benchmarks import legacy
+from benchmarks.common import load_listings, FrozenDatetime, best_of
+from benchmarks.bench_pipeline import NOW, TEMPLATE
+
+GOLDEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "README.md.gz")
+
+def render_all(render, listings):
+    return "".join(render(listings, off) for off in (False, True))
+
+def render_readme(listings):
+    """The README embedTable writes for listings into TEMPLATE, dated NOW."""
+    util.datetime = FrozenDatetime
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "README.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(TEMPLATE)
+        with contextlib.redirect_stdout(None):
+            util.embedTable([dict(l) for l in listings], path)
+        with open(path, "rb") as f:
+            return f.read()
+
+def check_golden(listings, update):
+    readme = render_readme(listings)
+    if update:
+        os.makedirs(os.path.dirname(GOLDEN), exist_ok=True)
+        with open(GOLDEN, "wb") as f:
+            f.write(gzip.compress(readme, 9, mtime=0))
+        print(f"wrote {os.path.relpath(GOLDEN)} ({len(readme):,} bytes)")
+        return
+    with gzip.open(GOLDEN) as f:
+        golden = f.read()
+    if readme != golden:
+        at = next((i for i, (a, b) in enumerate(zip(readme, golden)) if a != b), min(len(readme), len(golden)))
+        line = readme.count(b"\n", 0, at) + 1
+        sys.exit(f"README differs from {os.path.relpath(GOLDEN)} at line {line}: {readme[at - 80:at + 80]!r}\n"
+                 "rerun with --update if the change is intended")
+    print(f"README matches {os.path.relpath(GOLDEN)} ({len(readme):,} bytes)")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--listings", default="listings.json")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--update", action="store_true", help="rewrite the golden README instead of comparing")
+    args = parser.parse_args()
+
+    listings = load_listings(args.listings, args.scale)
+    FrozenDatetime.frozen = NOW
+    legacy.datetime = FrozenDatetime
+
+    before_s, expected = best_of(lambda: render_all(legacy.create_md_table, listings))
+    after_s, actual = best_of(lambda: render_all(lambda l, off: util.create_md_table(l, off, now=NOW), listings))
+
+    if actual != expected:
+        at = next(i for i, (a, b) in enumerate(zip(actual, expected)) if a != b)
+        sys.exit(f"output differs from the previous implementation at char {at}: {actual[at - 80:at + 80]!r}")
+    print(f"byte-identical output for {len(listings)} rows x 2 layouts ({len(actual.encode()):,} bytes)")
+    if args.scale == 1 and args.listings == "listings.json":
+        check_golden(listings, args.update)
+    else:
+        print("golden README check skipped: it covers the bundled listings at --scale 1")
+
+    rows = 2 * len(listings)
+    print(f"{'legacy string concat':<24}{before_s * 1000:>9.1f} ms {rows / before_s:>12,.0f} rows/s")
+    print(f"{'list buffer':<24}{after_s * 1000:>9.1f} ms {rows / after_s:>12,.0f} rows/s  ({before_s / after_s:.1f}x)")
+
+if __name__ == "__main__":
+    main()
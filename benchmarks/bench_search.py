@@ -0,0 +1,65 @@
+"""
+search_index against what it replaces: re-reading the listings snapshot
+and scanning every row for each query. Times the index build, save and
+load, then each query both ways and checks they find the same postings.
+
+    python -m benchmarks.bench_search [--scale N]
+"""
+import os
+import json
+import time
+import argparse
+import tempfile
+
+from canonical_url import UrlHashSet
+from search_index import SearchIndex, tokenize, locationTokens
+from benchmarks.common import load_listings, best_of
+
+NOW = time.mktime((2025, 10, 1, 12, 0, 0, 0, 0, -1))
+# (query, the same filter written as a scan over the snapshot rows)
+QUERIES = [
+    ("palantir AND active", lambda r: "palantir" in tokenize(r["company_name"]) and r["active"]),
+    ("nyc AND posted < 30d",
+     lambda r: any("nyc" in locationTokens(l) for l in r["locations"]) and r["date_posted"] >= NOW - 30 * 86400),
+    ("title:machine AND NOT inactive", lambda r: "machine" in tokenize(r["title"]) and r["active"]),
+    ("term:fall OR term:spring", lambda r: any({"fall", "spring"} & set(tokenize(t)) for t in r["terms"])),
+]
+
+def scan(path, keep):
+    with open(path) as f:
+        rows = json.load(f)
+    seen = UrlHashSet()
+    return {r["url"] for r in rows if seen.add(r["url"]) and keep(r)}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--listings", default="listings.json")
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    listings = load_listings(args.listings, args.scale)
+    with tempfile.TemporaryDirectory() as workdir:
+        snapshot = os.path.join(workdir, "listings.json")
+        index_path = os.path.join(workdir, "listings.index.json")
+        with open(snapshot, "w") as f:
+            json.dump(listings, f, indent=2)
+
+        build_s, index = best_of(lambda: SearchIndex.build_file(snapshot), repeat=1)
+        save_s, _ = best_of(lambda: index.save(index_path))
+        load_s, index = best_of(lambda: SearchIndex.load(index_path))
+        print(f"{len(index):,} postings from a {os.path.getsize(snapshot) / 1e6:.1f} MB snapshot")
+        print(f"build {build_s * 1000:.0f} ms, save {save_s * 1000:.0f} ms, load {load_s * 1000:.0f} ms, "
+              f"{os.path.getsize(index_path) / 1e6:.1f} MB on disk")
+
+        for query, keep in QUERIES:
+            scan_s, expected = best_of(lambda: scan(snapshot, keep))
+            cold = SearchIndex.load(index_path)
+            start = time.perf_counter()
+            ids = cold.search(query, NOW)
+            cold_s = time.perf_counter() - start
+            assert {index.docs[i][2] for i in ids} == expected, query
+            print(f"{query:<34}{len(ids):>6} matches  scan {scan_s * 1000:>7.1f} ms  index {cold_s * 1000:>6.2f} ms "
+                  f"({scan_s / cold_s:,.0f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Startup cost of each jobs.py command: `python -X importtime jobs.py CMD --help`
+in a fresh interpreter, with the import time the command itself adds on top
+of a bare interpreter, the wall time, and which of the heavy dependencies
+got loaded. The "eager" row imports every command module and dependency
+up front, which is what a single entry point without lazy imports would pay.
+
+Then checks that importing the modules is side-effect free: no .env or
+NOTION_* settings needed, no sys.exit, the process TZ left alone and no
+network connection attempted.
+
+    python -m benchmarks.bench_startup [--repeat 5]
+"""
+import os
+import re
+import sys
+import argparse
+import subprocess
+import statistics
+from time import perf_counter
+
+from jobs import COMMANDS
+
+HEAVY = ("numpy", "requests", "notion_client", "httpx", "dotenv")
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+\d+ \|( *)(\S+)")
+
+SIDE_EFFECTS = f"""
+import os, sys, socket, time
+def refuse(*args):
+    raise AssertionError(f"network access on import: {{args}}")
+socket.socket.connect = refuse
+socket.getaddrinfo = refuse
+tz = time.localtime().tm_gmtoff
+import {", ".join(module for module, _ in COMMANDS.values())}, notion_async
+assert os.environ.get("TZ") == "UTC" and time.localtime().tm_gmtoff == tz, "process timezone changed"
+assert not any(k.startswith("NOTION_") for k in os.environ), "settings loaded on import"
+import write_to_notion
+assert write_to_notion.notion is None and write_to_notion.NOTION_TOKEN is None
+print("ok")
+"""
+
+def env():
+    """The environment without NOTION_* settings, with bytecode caching on as in normal use."""
+    clean = {k: v for k, v in os.environ.items() if not k.startswith("NOTION_")}
+    clean.pop("PYTHONDONTWRITEBYTECODE", None)
+    return clean
+
+def run(args, workdir):
+    """Self import time in µs per module loaded by one fresh interpreter."""
+    out = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=workdir, env=env(),
+                         capture_output=True, text=True, check=True)
+    modules = {}
+    for line in out.stderr.splitlines():
+        m = IMPORT_LINE.match(line)
+        if m:
+            modules[m.group(3)] = modules.get(m.group(3), 0) + int(m.group(1))
+    return modules
+
+def measure(args, workdir, repeat):
+    """Median import ms, median wall ms and the set of modules loaded."""
+    imports, walls, modules = [], [], {}
+    run(args, workdir)  # warm the bytecode cache
+    for _ in range(repeat):
+        start = perf_counter()
+        modules = run(args, workdir)
+        walls.append((perf_counter() - start) * 1000)
+        imports.append(sum(modules.values()) / 1000)
+    return statistics.median(imports), statistics.median(walls), modules
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    workdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    bare_import, bare_wall, _ = measure(["-c", "pass"], workdir, args.repeat)
+    print(f"bare interpreter: {bare_import:.0f} ms imports, {bare_wall:.0f} ms wall; rows below are on top of it")
+    print(f"{'command':<10}{'imports':>10}{'wall':>10}  heavy modules loaded")
+    eager = ["-c", "import " + ", ".join((*HEAVY, *(module for module, _ in COMMANDS.values())))]
+    rows = [(name, ["jobs.py", name, "--help"]) for name in COMMANDS] + [("eager", eager)]
+    for name, command in rows:
+        import_ms, wall_ms, modules = measure(command, workdir, args.repeat)
+        heavy = [module for module in HEAVY if module in modules]
+        print(f"{name:<10}{import_ms - bare_import:>7.0f} ms{wall_ms - bare_wall:>7.0f} ms  {', '.join(heavy) or '-'}")
+
+    out = subprocess.run([sys.executable, "-c", SIDE_EFFECTS], cwd=workdir, env=dict(env(), TZ="UTC"),
+                         capture_output=True, text=True)
+    assert out.returncode == 0 and out.stdout.strip() == "ok", out.stderr or out.stdout
+    print("imports: no settings read, no exit, TZ untouched, no network")
+
+if __name__ == "__main__":
+    main()
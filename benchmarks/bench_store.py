@@ -0,0 +1,56 @@
+"""
+listings_store against the JSON snapshot it replaces: applying a scrape
+(first insert, then an update of the same rows) and reading the rows a
+consumer needs, active postings from the last 30 days, by indexed query
+versus parsing the whole file and filtering.
+
+    python -m benchmarks.bench_store [--scale N]
+"""
+import os
+import json
+import argparse
+import tempfile
+
+from util import listingRank
+from canonical_url import url_hash
+from listings_store import ListingStore
+from benchmarks.common import load_listings, best_of
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--listings", default="listings.json")
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    listings = load_listings(args.listings, args.scale)
+    since = max(l["date_posted"] for l in listings) - 30 * 86400
+    with tempfile.TemporaryDirectory() as workdir:
+        snapshot = os.path.join(workdir, "listings.json")
+        with open(snapshot, "w") as f:
+            json.dump(listings, f, indent=2)
+
+        with ListingStore(os.path.join(workdir, "listings.db")) as store:
+            insert_s, inserted = best_of(lambda: store.apply_scrape(listings, now=1), repeat=1)
+            update_s, updated = best_of(lambda: store.apply_scrape(listings, now=2), repeat=1)
+            print(f"{inserted['rows']:,} postings: insert {insert_s * 1000:.0f} ms, "
+                  f"update {update_s * 1000:.0f} ms ({updated['updated']:,} updated)")
+
+            def scan():
+                with open(snapshot) as f:
+                    rows = json.load(f)
+                # One row per posting, the one apply_scrape keeps, where the posting first appeared
+                kept = {}
+                for r in rows:
+                    key = url_hash(r["url"])
+                    if key not in kept or listingRank(r) > listingRank(kept[key]):
+                        kept[key] = r
+                return [r for r in kept.values() if r["active"] and r["date_posted"] > since]
+
+            scan_s, expected = best_of(scan)
+            query_s, rows = best_of(lambda: list(store.iter_listings(active=True, since=since)))
+            assert [r["url"] for r in rows] == [r["url"] for r in expected], "different rows"
+            print(f"{'parse + filter JSON':<24}{scan_s * 1000:>8.1f} ms {len(expected):>8,} rows")
+            print(f"{'indexed query':<24}{query_s * 1000:>8.1f} ms {len(rows):>8,} rows  ({scan_s / query_s:.1f}x)")
+
+if __name__ == "__main__":
+    main()
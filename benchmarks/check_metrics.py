@@ -0,0 +1,83 @@
+"""
+Checks that the pipeline's entry points record the timers and counters
+metrics.py promises. Each command is run as the nightly job runs it, in a
+fresh interpreter with JOBS_METRICS=<file>, against a local copy of the
+listings served over HTTP, and the summary it writes is checked for the
+expected names. Instrumentation left on a function the entry point no
+longer calls shows up here as a missing name.
+
+    python -m benchmarks.check_metrics [--listings listings.json]
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import functools
+import threading
+import subprocess
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.common import load_listings
+from benchmarks.bench_pipeline import TEMPLATE
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+EXPECTED = {
+    "scraper.py": {
+        "timers": ["scraper.fetch_listings_delta", "scraper.apply_scrape", "scraper.dedupe_by_url"],
+        "counters": ["scraper.rows_fetched", "scraper.bytes_downloaded",
+                     "dedupe_by_url.rows_in", "dedupe_by_url.rows_out"],
+    },
+    "render_readme.py": {
+        "timers": ["util.checkSchema", "util.embedTable", "util.CategoryIndex.build"],
+        "counters": ["CategoryIndex.rows_in", "CategoryIndex.rows_out", "embedTable.bytes_written"],
+    },
+}
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+def run(script, args, workdir):
+    """The metrics summary a run of script writes."""
+    path = os.path.join(workdir, f"{script}.metrics.json")
+    env = dict(os.environ, JOBS_METRICS=path)
+    subprocess.run([sys.executable, os.path.join(ROOT, script), *args], cwd=workdir, env=env,
+                   check=True, stdout=subprocess.DEVNULL)
+    with open(path) as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--listings", default="listings.json")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        with open(os.path.join(workdir, "upstream.json"), "w") as f:
+            json.dump(load_listings(args.listings), f)
+        with open(os.path.join(workdir, "README.md"), "w") as f:
+            f.write(TEMPLATE)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_QuietHandler, directory=workdir))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/upstream.json"
+        try:
+            summaries = {
+                "scraper.py": run("scraper.py", ["--url", url, "--db", "listings.db", "--json", "listings.json"], workdir),
+                "render_readme.py": run("render_readme.py", ["--listings", "listings.db", "--readme", "README.md"], workdir),
+            }
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    missing = []
+    for script, expected in EXPECTED.items():
+        for kind, names in expected.items():
+            missing += [f"{script}: {kind[:-1]} {name}" for name in names if name not in summaries[script][kind]]
+        timers = summaries[script]["timers"]
+        print(f"{script:<18}" + ", ".join(f"{name} {t['total_s'] * 1000:.0f} ms" for name, t in timers.items()))
+    assert not missing, "not recorded:\n  " + "\n  ".join(missing)
+    print("every expected timer and counter was recorded")
+
+if __name__ == "__main__":
+    main()
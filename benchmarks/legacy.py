@@ -0,0 +1,214 @@
+"""
+Reference copies of functions as they were before they were optimized.
+Benchmarks time them against the current implementations and check that
+both produce the same output.
+"""
+import re
+from datetime import datetime
+
+from util import FAANG_PLUS, getLocations, getSponsorship, getLink
+
+
+def classifyJobCategory(job):
+    # Always classify by title for better accuracy, ignore existing category
+    title = job.get("title", "").lower()
+    
+    # Filter out IT technical support roles that aren't really tech internships
+    if any(term in title for term in [
+        "it technical intern", "it technician", "it support", "technical support intern",
+        "help desk", "desktop support", "it help desk", "computer support", "security operations", "field operations",
+        "information technology"
+    ]):
+        return None
+    
+    # Hardware (first priority) - expanded keywords
+    if any(term in title for term in [
+        "hardware", "embedded", "fpga", "circuit", "chip", "silicon", "asic", "robotics", "firmware", 
+        "manufactur", "electrical", "mechanical", "systems engineer", "test engineer", "validation",
+        "verification", "pcb", "analog", "digital", "signal", "power", "rf", "antenna"
+    ]):
+        return "Hardware Engineering"
+    
+    # Quant (second priority) - expanded keywords
+    elif any(term in title for term in [
+        "quant", "quantitative", "trading", "finance", "investment", "financial", "risk", "portfolio",
+        "derivatives", "algorithmic trading", "market", "capital", "equity", "fixed income", "credit"
+    ]):
+        return "Quantitative Finance"
+    
+    # Data Science (third priority) - expanded keywords
+    elif any(term in title for term in [
+        "data science", "artificial intelligence", "data scientist", "ai", "machine learning", "ml", 
+        "data analytics", "data analyst", "research eng", "nlp", "computer vision", "research sci", 
+        "data eng", "analytics", "statistician", "modeling", "algorithms", "deep learning", "pytorch",
+        "tensorflow", "pandas", "numpy", "sql", "etl", "pipeline", "big data", "spark", "hadoop"
+    ]):
+        return "Data Science, AI & Machine Learning"
+    
+    # Product (fourth priority) - check before Software to catch "Software Product Management" roles
+    elif any(term in title for term in [
+        "product manag", "product analyst", "apm", "associate product", "product owner", "product design",
+        "product marketing", "product strategy", "business analyst", "program manag", "project manag"
+    ]) or ("product" in title and any(word in title for word in ["analyst", "manager", "associate", "coordinator"])):
+        return "Product Management"
+    
+    # Software Engineering (fifth priority) - greatly expanded keywords
+    elif any(term in title for term in [
+        "software", "engineer", "developer", "dev", "programming", "coding", "fullstack", "full-stack", 
+        "full stack", "frontend", "front end", "front-end", "backend", "back end", "back-end", 
+        "mobile", "web", "app", "application", "platform", "infrastructure", "cloud", "devops", 
+        "sre", "site reliability", "systems", "network", "security", "cybersecurity", "qa", 
+        "quality assurance", "test", "automation", "ci/cd", "deployment", "kubernetes", "docker",
+        "aws", "azure", "gcp", "api", "microservices", "database", "java", "python", "javascript",
+        "react", "node", "golang", "rust", "c++", "c#", ".net", "ios", "android", "flutter",
+        "technical", "technology", "tech", "coding", "programming", "sde", "swe"
+    ]):
+        return "Software Engineering"
+    
+    # Return None for jobs that don't fit any category (will be filtered out)
+    else:
+        return None
+
+
+def convert_markdown_to_html(text):
+    """Convert markdown formatting to HTML for proper rendering in HTML table cells"""
+    # Convert **bold** to <strong>bold</strong>
+    text = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', text)
+    
+    # Convert [link text](url) to <a href="url">link text</a>
+    text = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2">\1</a>', text)
+    
+    return text
+
+
+def create_md_table(listings, offSeason=False):
+    # Create clean HTML table with minimal styling
+    table = '<table>\n<thead>\n<tr>\n'
+    
+    if offSeason:
+        table += '<th>Company</th>\n'
+        table += '<th>Role</th>\n'
+        table += '<th>Location</th>\n'
+        table += '<th>Terms</th>\n'
+        table += '<th>Application</th>\n'
+        table += '<th>Age</th>\n'
+    else:
+        table += '<th>Company</th>\n'
+        table += '<th>Role</th>\n'
+        table += '<th>Location</th>\n'
+        table += '<th>Application</th>\n'
+        table += '<th>Age</th>\n'
+    
+    table += '</tr>\n</thead>\n<tbody>\n'
+
+    prev_company = None
+    prev_days_active = None  # FIXED: previously incorrectly using date_posted
+
+    for listing in listings:
+        # Check if this is a FAANG+ company for fire emoji
+        company_name = listing["company_name"]
+        is_faang_plus = company_name.lower() in FAANG_PLUS
+        
+        raw_url = listing.get("company_url", "").strip()
+        company_url = raw_url + '?utm_source=GHList&utm_medium=company' if raw_url.startswith("http") else ""
+        company_markdown = f"**[{company_name}]({company_url})**" if company_url else f"**{company_name}**"
+        
+        # Add fire emoji outside the link for FAANG+ companies
+        if is_faang_plus:
+            company_markdown = f"🔥 {company_markdown}"
+        
+        company = convert_markdown_to_html(company_markdown)
+        location = getLocations(listing)
+        
+        # Check for advanced degree requirements and add graduation cap emoji
+        title_with_degree_emoji = listing["title"]
+        
+        # Check degrees field for advanced degree requirements
+        degrees = listing.get("degrees", [])
+        if degrees:
+            # Check if only advanced degrees are required (no Bachelor's or Associate's)
+            has_bachelors_or_associates = any(
+                degree.lower() in ["bachelor's", "associate's"]
+                for degree in degrees
+            )
+            has_advanced_degrees = any(
+                degree.lower() in ["master's", "phd", "mba"]
+                for degree in degrees
+            )
+            
+            if has_advanced_degrees and not has_bachelors_or_associates:
+                title_with_degree_emoji += " 🎓"
+        
+        # Also check title text for degree mentions
+        title_lower = listing["title"].lower()
+        if any(term in title_lower for term in ["master's", "masters", "master", "mba", "phd", "ph.d", "doctorate", "doctoral"]):
+            if "🎓" not in title_with_degree_emoji:
+                title_with_degree_emoji += " 🎓"
+        
+        position = title_with_degree_emoji + getSponsorship(listing)
+        terms = ", ".join(listing["terms"])
+        link = getLink(listing)
+
+        # calculate days active
+        days_active = (datetime.now() - datetime.fromtimestamp(listing["date_posted"])).days
+        days_active = max(days_active, 0)  # in case somehow negative
+        days_display = (
+            "0d" if days_active == 0 else
+            f"{(days_active // 30)}mo" if days_active > 30 else
+            f"{days_active}d"
+        )
+            
+        # FIXED: comparison to see if same company and same days active
+        if prev_company == company_name and prev_days_active == days_active:
+            company = "↳"
+        else:
+            prev_company = company_name
+            prev_days_active = days_active
+        
+        # Create HTML table row
+        table += '<tr>\n'
+        
+        if offSeason:
+            table += f'<td>{company}</td>\n'
+            table += f'<td>{position}</td>\n'
+            table += f'<td>{location}</td>\n'
+            table += f'<td>{terms}</td>\n'
+            table += f'<td>{link}</td>\n'
+            table += f'<td>{days_display}</td>\n'
+        else:
+            table += f'<td>{company}</td>\n'
+            table += f'<td>{position}</td>\n'
+            table += f'<td>{location}</td>\n'
+            table += f'<td>{link}</td>\n'
+            table += f'<td>{days_display}</td>\n'
+        
+        table += '</tr>\n'
+
+    table += '</tbody>\n</table>\n'
+    return table
+
+def sortListings(listings):
+    oldestListingFromCompany = {}
+    linkForCompany = {}
+
+    for listing in listings:
+        date_posted = listing["date_posted"]
+        if listing["company_name"].lower() not in oldestListingFromCompany or oldestListingFromCompany[listing["company_name"].lower()] > date_posted:
+            oldestListingFromCompany[listing["company_name"].lower()] = date_posted
+        if listing["company_name"] not in linkForCompany or len(listing["company_url"]) > 0:
+            linkForCompany[listing["company_name"]] = listing["company_url"]
+
+    listings.sort(
+        key=lambda x: (
+            x["active"],  # Active listings first
+            x['date_posted'],
+            x['company_name'].lower(),
+            x['date_updated']
+        ),
+        reverse=True
+    )
+
+    for listing in listings:
+        listing["company_url"] = linkForCompany[listing["company_name"]]
+
+    return listings
@@ -0,0 +1,212 @@
+"""
+A local stand-in for the parts of the Notion API write_to_notion.py uses:
+database queries (with last_edited_time and rich_text equals/is_empty
+filters and cursor pagination), database update, page create and page
+update. Pages live in memory. As in Notion, archive() hides a page from
+queries and makes updates to it fail with a validation_error.
+Every request can be delayed by a fixed latency, and a fraction of them can
+be answered with 429 + Retry-After to exercise the client's backoff.
+
+    with MockNotion(latency=0.02, rate_limit=0.05) as mock:
+        notion = Client(auth="secret", base_url=mock.url)
+
+    python -m benchmarks.mock_notion [--port 8765] [--latency S] [--rate-limit P]
+"""
+import re
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_QUERY = re.compile(r"^/v1/databases/([^/]+)/query$")
+_PAGE = re.compile(r"^/v1/pages/([^/]+)$")
+_DATABASE = re.compile(r"^/v1/databases/([^/]+)$")
+
+def _plain(prop):
+    """Fill in plain_text the way Notion echoes rich text and titles back."""
+    for kind in ("title", "rich_text"):
+        if kind in prop:
+            prop = dict(prop)
+            prop[kind] = [dict(t, plain_text=t.get("text", {}).get("content", "")) for t in prop[kind]]
+    return prop
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # the default backlog of 5 resets bursts of new connections
+
+class MockNotion:
+    def __init__(self, latency=0.0, rate_limit=0.0, retry_after=0, host="127.0.0.1", port=0, seed=0):
+        self.latency = latency
+        self.rate_limit = rate_limit      # probability a request gets a 429
+        self.retry_after = retry_after    # seconds sent in Retry-After
+        self.pages = {}                   # page id -> page object, in creation order
+        self.schemas = {}                 # database id -> properties added via databases.update
+        self.requests = Counter()         # "METHOD endpoint" -> count
+        self.lock = threading.Lock()
+        self.random = random.Random(seed)
+        self._clock = 0
+        self.server = _Server((host, port), self._handler())
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _edited(self):
+        # Strictly increasing timestamps so incremental queries see every edit
+        self._clock = max(self._clock + 1, int(time.time() * 1000))
+        stamp = datetime.fromtimestamp(self._clock / 1000, timezone.utc)
+        return stamp.strftime("%Y-%m-%dT%H:%M:%S.") + f"{self._clock % 1000:03d}Z"
+
+    def _matches(self, page, flt):
+        if not flt:
+            return True
+        if flt.get("timestamp") == "last_edited_time":
+            return page["last_edited_time"] >= flt["last_edited_time"]["on_or_after"]
+        if "rich_text" in flt:
+            prop = page["properties"].get(flt["property"], {})
+            text = "".join(t["plain_text"] for t in prop.get("rich_text", []))
+            if "is_empty" in flt["rich_text"]:
+                return not text
+            return text == flt["rich_text"]["equals"]
+        return True
+
+    def query(self, db_id, body):
+        size = min(int(body.get("page_size") or 100), 100)
+        start = int(body.get("start_cursor") or 0)
+        with self.lock:
+            rows = [p for p in self.pages.values()
+                    if p["parent"]["database_id"] == db_id and not p["archived"]
+                    and self._matches(p, body.get("filter"))]
+        chunk = rows[start:start + size]
+        more = start + size < len(rows)
+        return 200, {"object": "list", "results": chunk, "has_more": more,
+                     "next_cursor": str(start + size) if more else None}
+
+    def create(self, body):
+        with self.lock:
+            page_id = str(uuid.UUID(int=self.random.getrandbits(128)))
+            page = {"object": "page", "id": page_id, "archived": False, "in_trash": False,
+                    "parent": body["parent"], "last_edited_time": self._edited(),
+                    "properties": {k: _plain(v) for k, v in body.get("properties", {}).items()}}
+            self.pages[page_id] = page
+        return 200, page
+
+    def update(self, page_id, body):
+        with self.lock:
+            page = self.pages.get(page_id)
+            if page is None:
+                return 404, {"object": "error", "status": 404, "code": "object_not_found",
+                             "message": f"Could not find page with ID: {page_id}."}
+            if page["archived"]:
+                return 400, {"object": "error", "status": 400, "code": "validation_error",
+                             "message": "Can't edit block that is archived. You must unarchive the block before editing."}
+            page["properties"].update({k: _plain(v) for k, v in body.get("properties", {}).items()})
+            page["last_edited_time"] = self._edited()
+        return 200, page
+
+    def archive(self, page_id):
+        """Move a page to the trash, as deleting it in the Notion UI does."""
+        with self.lock:
+            page = self.pages[page_id]
+            page["archived"] = page["in_trash"] = True
+            page["last_edited_time"] = self._edited()
+
+    def update_database(self, db_id, body):
+        with self.lock:
+            self.schemas.setdefault(db_id, {}).update(body.get("properties", {}))
+        return 200, {"object": "database", "id": db_id, "properties": self.schemas[db_id]}
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # avoid delayed-ACK stalls on kept-alive connections
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body, headers=()):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _dispatch(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if mock.latency:
+                    time.sleep(mock.latency)
+
+                if (m := _QUERY.match(self.path)) and self.command == "POST":
+                    endpoint, handle = "databases.query", lambda: mock.query(m.group(1), body)
+                elif self.path == "/v1/pages" and self.command == "POST":
+                    endpoint, handle = "pages.create", lambda: mock.create(body)
+                elif (m := _PAGE.match(self.path)) and self.command == "PATCH":
+                    endpoint, handle = "pages.update", lambda: mock.update(m.group(1), body)
+                elif (m := _DATABASE.match(self.path)) and self.command == "PATCH":
+                    endpoint, handle = "databases.update", lambda: mock.update_database(m.group(1), body)
+                else:
+                    return self._reply(400, {"object": "error", "status": 400, "code": "invalid_request_url",
+                                             "message": f"Invalid request URL: {self.command} {self.path}"})
+
+                with mock.lock:
+                    mock.requests[endpoint] += 1
+                    limited = mock.rate_limit and mock.random.random() < mock.rate_limit
+                    if limited:
+                        mock.requests["429"] += 1
+                if limited:
+                    return self._reply(429, {"object": "error", "status": 429, "code": "rate_limited",
+                                             "message": "You have been rate limited."},
+                                       [("Retry-After", str(mock.retry_after))])
+                self._reply(*handle())
+
+            do_POST = do_PATCH = _dispatch
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a mock Notion API until interrupted.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=0, help="Retry-After seconds on 429s")
+    args = parser.parse_args()
+
+    mock = MockNotion(args.latency, args.rate_limit, args.retry_after, port=args.port)
+    print(f"Mock Notion API on {mock.url} (use Client(base_url=...))")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(dict(mock.requests))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Canonical job URLs and compact URL hashes, shared by the scraper's dedupe,
+the Notion sync and the README renderer.
+
+canonical_url() is a conservative rewrite that still opens the same page:
+scheme added and lowercased, host lowercased, default port, credentials,
+fragment, tracking parameters and trailing slash dropped (an empty path
+becomes "/", so https://x.com and https://x.com/ agree), remaining query
+parameters sorted (as written, not re-encoded), and the two Greenhouse
+board hosts unified. It works on the string directly rather than through
+urllib.parse, which is several times slower per URL.
+
+url_hash() identifies the posting rather than the page. On top of
+canonical_url it folds the different entry points to one job: Greenhouse
+board, embed (token=) and careers-site (gh_jid=) links share a key, and
+Lever's /apply form shares one with its job page. Short-link redirectors
+such as grnh.se cannot be resolved without a request, so they are only
+canonicalized.
+
+The hash is the first 8 bytes of BLAKE2b, stored as an int in UrlHashSet
+and as packed uint64s on disk.
+"""
+import os
+import re
+from array import array
+from hashlib import blake2b
+
+from atomicfile import atomic_open
+
+HASH_BYTES = 8
+
+# Query parameters that only say where a click came from
+TRACKING_PARAMS = frozenset({
+    "ref", "src", "source", "gh_src", "lever-source", "lever-origin", "trk", "trackingid",
+    "fbclid", "gclid", "msclkid", "mc_cid", "mc_eid", "_hsenc", "_hsmi", "hscta", "hsctatracking",
+    "utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content", "utm_id",
+})
+
+GREENHOUSE_HOSTS = frozenset({"boards.greenhouse.io", "job-boards.greenhouse.io"})
+_GREENHOUSE_JOB = re.compile(r"^/[^/]+/jobs/(\d+)")
+_LEVER_APPLY = re.compile(r"^(/[^/]+/[0-9a-f-]{36})/apply$")
+
+_DEFAULT_PORTS = {"http": ":80", "https": ":443"}
+
+def _split(url):
+    """(scheme, host, path, query) of a URL without its fragment, host lowercased."""
+    scheme, sep, rest = url.partition("://")
+    if sep:
+        scheme = scheme.lower()
+    else:
+        scheme, rest = "https", url
+    rest = rest.partition("#")[0]
+    rest, _, query = rest.partition("?")
+    host, slash, path = rest.partition("/")
+    host = host.rpartition("@")[2].lower()
+    port = _DEFAULT_PORTS.get(scheme)
+    if port and host.endswith(port):
+        host = host[:-len(port)]
+    return scheme, host, slash + path, query
+
+def canonical_url(url: str) -> str:
+    url = (url or "").strip()
+    if not url:
+        return url
+    scheme, host, path, query = _split(url)
+    if host in GREENHOUSE_HOSTS:
+        host = "job-boards.greenhouse.io"
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/") or "/"
+    elif not path:
+        path = "/"
+    if query:
+        # Parameters are kept exactly as written (no re-encoding), only filtered and sorted
+        params = sorted(p for p in query.split("&")
+                        if p and p.partition("=")[0].lower() not in TRACKING_PARAMS)
+        query = "&".join(params)
+    return f"{scheme}://{host}{path}?{query}" if query else f"{scheme}://{host}{path}"
+
+def _param(query, name):
+    for p in query.split("&"):
+        key, _, value = p.partition("=")
+        if key == name:
+            return value
+    return ""
+
+def posting_key(url: str) -> str:
+    """canonical_url folded further so every link to one posting gives the same string."""
+    canonical = canonical_url(url)
+    _, host, path, query = _split(canonical)
+    if host == "job-boards.greenhouse.io":
+        job = _GREENHOUSE_JOB.match(path)
+        if job:
+            return f"greenhouse:{job.group(1)}"
+        if path == "/embed/job_app" and _param(query, "token").isdigit():
+            return f"greenhouse:{_param(query, 'token')}"
+    if "gh_jid=" in query and _param(query, "gh_jid").isdigit():
+        return f"greenhouse:{_param(query, 'gh_jid')}"
+    if host == "jobs.lever.co" and path.endswith("/apply"):
+        apply = _LEVER_APPLY.match(path)
+        if apply:
+            return canonical.replace(path, apply.group(1), 1)
+    return canonical
+
+def url_hash(url: str) -> int:
+    """Fixed-width (HASH_BYTES) hash of the posting a URL points to."""
+    return int.from_bytes(blake2b(posting_key(url).encode(), digest_size=HASH_BYTES).digest(), "big")
+
+class UrlHashSet:
+    """Set of url_hash values; add() reports whether the URL's posting was new."""
+
+    def __init__(self, hashes=()):
+        self.hashes = set(hashes)
+
+    def add(self, url: str) -> bool:
+        h = url_hash(url)
+        if h in self.hashes:
+            return False
+        self.hashes.add(h)
+        return True
+
+    def __contains__(self, url: str) -> bool:
+        return url_hash(url) in self.hashes
+
+    def __len__(self):
+        return len(self.hashes)
+
+    @classmethod
+    def load(cls, path: str):
+        """Read a file written by save(); a missing file gives an empty set."""
+        packed = array("Q")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                packed.frombytes(f.read())
+        return cls(packed)
+
+    def save(self, path: str):
+        """Write the hashes as sorted native-endian uint64s, atomically."""
+        with atomic_open(path, "wb") as f:
+            array("Q", sorted(self.hashes)).tofile(f)
@@ -1,17 +1,41 @@
-from notion_client import Client
-from dotenv import load_dotenv
+"""
+Print the databases the NOTION_TOKEN integration can see, to find the
+NOTION_DB_ID for .env.
+
+    python get_db_id.py [--limit 10]
+"""
 import os
+import sys
+import argparse
+
+def find_databases(limit: int = 10):
+    """(title, id) of up to limit databases shared with the integration."""
+    from dotenv import load_dotenv
+    from notion_client import Client
 
-load_dotenv()
-notion = Client(auth=os.getenv("NOTION_TOKEN"))
+    load_dotenv()
+    token = os.getenv("NOTION_TOKEN")
+    if not token:
+        raise RuntimeError("set NOTION_TOKEN in your .env")
+    notion = Client(auth=token)
+    res = notion.search(
+        filter={"value": "database", "property": "object"},
+        page_size=limit,
+    )
+    return [("".join(t["plain_text"] for t in db.get("title", [])), db["id"]) for db in res["results"]]
 
-res = notion.search(
-    filter={"value": "database", "property": "object"},
-    page_size=10,
-)
+def main():
+    parser = argparse.ArgumentParser(description="List the Notion databases shared with NOTION_TOKEN's integration.")
+    parser.add_argument("--limit", type=int, default=10, help="Databases to list")
+    args = parser.parse_args()
+    try:
+        databases = find_databases(args.limit)
+    except RuntimeError as e:
+        sys.exit(f"ERROR: {e}")
+    for title, db_id in databases:
+        print("Title:", title or "(untitled)")
+        print("Database ID:", db_id)
+        print()
 
-for db in res["results"]:
-    title = "".join([t["plain_text"] for t in db.get("title", [])])
-    print("Title:", title or "(untitled)")
-    print("Database ID:", db["id"])
-    print()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+One entry point for the pipeline's commands:
+
+    python jobs.py scrape  [...]    fetch upstream into the listings store   (scraper.py)
+    python jobs.py render  [...]    regenerate the README tables             (render_readme.py)
+    python jobs.py sync    [...]    add/update jobs in the Notion tracker    (write_to_notion.py)
+    python jobs.py find-db [...]    list Notion databases for NOTION_DB_ID   (get_db_id.py)
+    python jobs.py search  [...]    build or query the search index          (search_index.py)
+    python jobs.py watch   [...]    poll upstream and keep everything current (watch.py)
+
+Only the chosen command's module is imported, so `jobs.py render` never
+loads notion_client or requests, and nothing reads .env or touches the
+network before the command runs. Arguments after the command go to that
+module's main(), e.g. `python jobs.py sync --help`.
+"""
+import sys
+import importlib
+
+COMMANDS = {
+    "scrape": ("scraper", "Fetch the upstream listings and record them"),
+    "render": ("render_readme", "Regenerate the category tables in a README"),
+    "sync": ("write_to_notion", "Add/update jobs in the Notion tracker"),
+    "find-db": ("get_db_id", "List the Notion databases shared with the integration"),
+    "search": ("search_index", "Build or query the listings search index"),
+    "watch": ("watch", "Poll upstream and keep the store, Notion and README current"),
+}
+
+def usage() -> str:
+    width = max(map(len, COMMANDS))
+    lines = ["usage: jobs.py COMMAND [ARGS...]", "", "commands:"]
+    lines += [f"  {name:<{width}}  {summary}" for name, (_, summary) in COMMANDS.items()]
+    lines += ["", "Run `jobs.py COMMAND --help` for a command's options."]
+    return "\n".join(lines)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return
+    command, *rest = argv
+    if command not in COMMANDS:
+        sys.exit(f"{usage()}\n\njobs.py: unknown command {command!r}")
+    module = importlib.import_module(COMMANDS[command][0])
+    # The module's argparse reads sys.argv and names itself after argv[0]
+    sys.argv = [f"jobs.py {command}", *rest]
+    return module.main()
+
+if __name__ == "__main__":
+    main()
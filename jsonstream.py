@@ -0,0 +1,98 @@
+"""
+Incremental parsing of large top-level JSON arrays.
+
+iter_array() yields the array's elements one at a time from an iterable of
+bytes/str chunks (an HTTP response body, a file read in blocks), so only the
+element being decoded and the unread tail of the current chunk are held in
+memory.
+"""
+import json
+import codecs
+
+CHUNK_SIZE = 64 * 1024
+_WS = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+def iter_array(chunks):
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buf, pos = "", 0
+    started = done = False
+    after_value = after_comma = False  # what the last token was, to require one "," between elements
+
+    def parse(final):
+        # Yield every complete element in buf[pos:]; stop at an incomplete one
+        nonlocal pos, started, done, after_value, after_comma
+        while not done:
+            while pos < len(buf) and buf[pos] in _WS:
+                pos += 1
+            if pos == len(buf):
+                return
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError("expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                if after_comma:
+                    raise json.JSONDecodeError("Expecting value", buf, pos)
+                done = True
+                return
+            if buf[pos] == ",":
+                if not after_value:
+                    raise json.JSONDecodeError("Expecting value", buf, pos)
+                after_value, after_comma = False, True
+                pos += 1
+                continue
+            if after_value:
+                raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                return
+            if not final and isinstance(obj, (int, float)) and not isinstance(obj, bool) \
+                    and (end == len(buf) or buf[end] in _NUMBER_CHARS):
+                # A number may continue in the next chunk ("1" of "1.5e3")
+                return
+            pos = end
+            after_value, after_comma = True, False
+            yield obj
+
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            chunk = utf8.decode(chunk)
+        buf = buf[pos:] + chunk
+        pos = 0
+        yield from parse(final=False)
+        if done:
+            return
+    buf = buf[pos:] + utf8.decode(b"", final=True)
+    pos = 0
+    yield from parse(final=True)
+    if not done:
+        raise ValueError("unterminated JSON array")
+
+def iter_chunks(f, chunk_size=CHUNK_SIZE):
+    while chunk := f.read(chunk_size):
+        yield chunk
+
+def iter_file(path, chunk_size=CHUNK_SIZE):
+    with open(path, "rb") as f:
+        yield from iter_array(iter_chunks(f, chunk_size))
+
+def dump_array(rows, f, indent=2):
+    """
+    Write rows as a JSON array one element at a time, byte-identical to
+    json.dump(list(rows), f, indent=indent). Returns the number written.
+    """
+    pad = " " * indent
+    count = 0
+    for row in rows:
+        f.write(",\n" if count else "[\n")
+        f.write(pad + json.dumps(row, indent=indent).replace("\n", "\n" + pad))
+        count += 1
+    f.write("\n]" if count else "[]")
+    return count
@@ -0,0 +1,217 @@
+"""
+Columnar in-memory store for listings.
+
+ListingTable keeps the numeric fields (date_posted, date_updated, active,
+is_visible) in typed arrays and interns the repetitive strings (company
+names and URLs, sources, categories, term and location lists), so a large
+listing set costs a few bytes per row per column instead of a dict per
+listing. The util.py stages that only look at those fields have vectorized
+counterparts here; NumPy is used when it is installed, plain arrays and
+loops otherwise. toListings() turns rows back into dicts for rendering.
+"""
+from array import array
+
+import util
+from util import daysSince
+
+try:
+    import numpy as np
+except ImportError:  # optional
+    np = None
+
+NUMERIC = {"date_posted": "q", "date_updated": "q", "active": "b", "is_visible": "b"}
+INTERNED = ("company_name", "company_url", "source", "category", "sponsorship", "terms", "locations", "degrees")
+PLAIN = ("id", "title", "url")
+
+_MISSING = object()
+
+class Interner:
+    """Maps values to small integer codes; list values are stored as tuples."""
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def code(self, value):
+        if isinstance(value, list):
+            value = tuple(value)
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def value(self, code):
+        value = self.values[code]
+        return list(value) if isinstance(value, tuple) else value
+
+class ListingTable:
+    def __init__(self):
+        self.size = 0
+        self.numeric = {name: array(typecode) for name, typecode in NUMERIC.items()}
+        self.pools = {name: Interner() for name in INTERNED}
+        self.coded = {name: array("I") for name in INTERNED}
+        self.plain = {name: [] for name in PLAIN}
+        self.present = {}  # field -> array("b") for optional fields some rows lack
+
+    @classmethod
+    def fromListings(cls, listings):
+        table = cls()
+        for listing in listings:
+            table.append(listing)
+        return table
+
+    def append(self, listing):
+        row = self.size
+        for name in NUMERIC:
+            self.numeric[name].append(int(self._get(listing, name, row, 0)))
+        for name in INTERNED:
+            self.coded[name].append(self.pools[name].code(self._get(listing, name, row, None)))
+        for name in PLAIN:
+            self.plain[name].append(self._get(listing, name, row, None))
+        self.size += 1
+
+    def _get(self, listing, name, row, default):
+        value = listing.get(name, _MISSING)
+        flags = self.present.get(name)
+        if value is _MISSING:
+            if flags is None:
+                flags = self.present[name] = array("b", [1]) * row
+            flags.append(0)
+            return default
+        if flags is not None:
+            flags.append(1)
+        return value
+
+    def __len__(self):
+        return self.size
+
+    def row(self, i):
+        listing = {}
+        for name in NUMERIC:
+            if self._has(name, i):
+                value = self.numeric[name][i]
+                listing[name] = bool(value) if NUMERIC[name] == "b" else value
+        for name in INTERNED:
+            if self._has(name, i):
+                listing[name] = self.pools[name].value(self.coded[name][i])
+        for name in PLAIN:
+            if self._has(name, i):
+                listing[name] = self.plain[name][i]
+        return listing
+
+    def _has(self, name, i):
+        flags = self.present.get(name)
+        return flags is None or flags[i]
+
+    def toListings(self):
+        return [self.row(i) for i in range(self.size)]
+
+    def take(self, indices):
+        """New table holding the given rows, in the given order; pools are shared."""
+        indices = list(indices) if np is None else np.asarray(indices, dtype=np.int64)
+        out = ListingTable()
+        out.size = len(indices)
+        out.pools = self.pools
+        for name, typecode in NUMERIC.items():
+            out.numeric[name] = self._gather(self.numeric[name], typecode, indices)
+        for name in INTERNED:
+            out.coded[name] = self._gather(self.coded[name], "I", indices)
+        for name in PLAIN:
+            column = self.plain[name]
+            out.plain[name] = [column[i] for i in indices]
+        out.present = {name: self._gather(flags, "b", indices) for name, flags in self.present.items()}
+        return out
+
+    @staticmethod
+    def _gather(column, typecode, indices):
+        if np is None:
+            return array(typecode, [column[i] for i in indices])
+        gathered = array(typecode)
+        gathered.frombytes(np.frombuffer(column, dtype=column.typecode)[indices].tobytes())
+        return gathered
+
+    def _view(self, column):
+        return np.frombuffer(column, dtype=column.typecode)
+
+    def _flagsByCode(self, pool, predicate):
+        """Evaluate predicate once per interned value and return a lookup by code."""
+        flags = [bool(predicate(value)) for value in self.pools[pool].values]
+        return np.array(flags, dtype=bool) if np is not None else flags
+
+    # Vectorized counterparts of the util.py stages
+
+    def mark_stale_listings(self, now=None):
+        now = now or util.localNow()
+        days = daysSince(self.numeric["date_posted"], now)
+        # util.staleAfterDays once per interned source, indexed by source code
+        thresholds = [util.staleAfterDays(source) for source in self.pools["source"].values]
+        active = self.numeric["active"]
+        if np is not None:
+            threshold = np.array(thresholds, dtype=np.int64)[self._view(self.coded["source"])]
+            view = self._view(active)
+            view[days >= threshold] = 0
+        else:
+            codes = self.coded["source"]
+            for i, d in enumerate(days):
+                if d >= thresholds[codes[i]]:
+                    active[i] = 0
+        return self
+
+    def filter_active(self):
+        if np is not None:
+            return self.take(np.flatnonzero(self._view(self.numeric["active"])))
+        return self.take(i for i, a in enumerate(self.numeric["active"]) if a)
+
+    def filterSummer(self, year, earliest_date):
+        summer_term = f"Summer {year}"
+        blocked_urls_lower = {url.lower() for url in util.BLOCKED_COMPANIES}
+        has_term = self._flagsByCode("terms", lambda terms: any(summer_term in item for item in terms or ()))
+        allowed = self._flagsByCode("company_url", lambda url: not any(
+            blocked in (url or "").lower() for blocked in blocked_urls_lower))
+        if np is not None:
+            keep = (self._view(self.numeric["is_visible"]).astype(bool)
+                    & has_term[self._view(self.coded["terms"])]
+                    & (self._view(self.numeric["date_posted"]) > earliest_date)
+                    & allowed[self._view(self.coded["company_url"])])
+            return self.take(np.flatnonzero(keep))
+        visible, terms, posted, urls = (self.numeric["is_visible"], self.coded["terms"],
+                                        self.numeric["date_posted"], self.coded["company_url"])
+        return self.take(i for i in range(self.size)
+                         if visible[i] and has_term[terms[i]] and posted[i] > earliest_date and allowed[urls[i]])
+
+    def sortListings(self):
+        """
+        Same order as util.sortListings (active, date_posted, lowercased
+        company, date_updated; descending, stable) and the same company_url
+        rewrite. Returns a new table.
+        """
+        names = self.pools["company_name"].values
+        lowered = sorted({name.lower() for name in names if name is not None})
+        rank_of = {name: i for i, name in enumerate(lowered)}
+        rank = [rank_of[name.lower()] if name is not None else -1 for name in names]
+
+        # Last non-empty company_url per company name (first one if all are empty)
+        link = {}
+        urls = self.coded["company_url"]
+        for i, code in enumerate(self.coded["company_name"]):
+            if code not in link or self.pools["company_url"].values[urls[i]]:
+                link[code] = urls[i]
+
+        if np is not None:
+            codes = self._view(self.coded["company_name"])
+            order = np.lexsort((
+                np.arange(self.size),
+                -self._view(self.numeric["date_updated"]),
+                -np.array(rank, dtype=np.int64)[codes],
+                -self._view(self.numeric["date_posted"]),
+                -self._view(self.numeric["active"]).astype(np.int64),
+            ))
+        else:
+            active, posted, updated, codes = (self.numeric["active"], self.numeric["date_posted"],
+                                              self.numeric["date_updated"], self.coded["company_name"])
+            order = sorted(range(self.size), key=lambda i: (active[i], posted[i], rank[codes[i]], updated[i]), reverse=True)
+
+        out = self.take(order)
+        out.coded["company_url"] = array("I", (link[code] for code in out.coded["company_name"]))
+        return out
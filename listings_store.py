@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+SQLite history of scraped listings, keyed by canonical_url.posting_key.
+
+Each scrape is applied with ListingStore.apply_scrape() as one transaction:
+new postings are inserted with first_seen set, known ones are updated in
+place, and every posting in the scrape gets last_seen = the scrape time.
+Postings that dropped out of the upstream file keep their rows, so the
+store is a history; readers ask for current=True to get only what the
+latest scrape contained.
+
+date_posted, company_name, active and category are indexed columns, so
+readers (util.getListingsFromStore, render_readme.py, write_to_notion.py
+--not-applied) load only the rows they need. The full upstream row is kept
+as JSON in data.
+
+    python listings_store.py import FILE [--db PATH]    apply a listings JSON file as a scrape
+    python listings_store.py stats [--db PATH]
+"""
+import os
+import json
+import errno
+import time
+import sqlite3
+import argparse
+
+from canonical_url import posting_key
+from jsonstream import iter_file
+
+DEFAULT_PATH = os.getenv("LISTINGS_DB", ".cache/listings.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    key          TEXT PRIMARY KEY,   -- canonical_url.posting_key(url)
+    url          TEXT NOT NULL,
+    company_name TEXT NOT NULL,
+    title        TEXT NOT NULL,
+    category     TEXT,               -- util.classifyJobCategory, NULL if none fits
+    date_posted  INTEGER NOT NULL,
+    date_updated INTEGER,
+    active       INTEGER NOT NULL,
+    is_visible   INTEGER NOT NULL,
+    first_seen   INTEGER NOT NULL,
+    last_seen    INTEGER NOT NULL,
+    position     INTEGER NOT NULL,   -- index in the scrape that last saw it
+    data         TEXT NOT NULL       -- the upstream row as JSON
+);
+CREATE INDEX IF NOT EXISTS listings_date_posted ON listings(date_posted);
+CREATE INDEX IF NOT EXISTS listings_company_name ON listings(company_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS listings_active ON listings(active, date_posted);
+CREATE INDEX IF NOT EXISTS listings_category ON listings(category, active);
+CREATE INDEX IF NOT EXISTS listings_last_seen ON listings(last_seen);
+CREATE TABLE IF NOT EXISTS scrapes (
+    at       INTEGER PRIMARY KEY,
+    rows     INTEGER NOT NULL,
+    inserted INTEGER NOT NULL,
+    updated  INTEGER NOT NULL
+);
+"""
+
+_UPSERT = """
+INSERT INTO listings (key, url, company_name, title, category, date_posted, date_updated,
+                      active, is_visible, first_seen, last_seen, position, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(key) DO UPDATE SET
+    url = excluded.url, company_name = excluded.company_name, title = excluded.title,
+    category = excluded.category, date_posted = excluded.date_posted,
+    date_updated = excluded.date_updated, active = excluded.active,
+    is_visible = excluded.is_visible, last_seen = excluded.last_seen, position = excluded.position,
+    data = excluded.data
+"""
+
+class ListingStore:
+    """
+        with ListingStore() as store:
+            store.apply_scrape(rows)
+            recent = list(store.iter_listings(active=True, since=cutoff))
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, create: bool = True):
+        """
+        Open (and with create, start if missing) the store at path. Readers
+        pass create=False so a mistyped path raises FileNotFoundError
+        instead of reading an empty store.
+        """
+        if not create and not os.path.exists(path):
+            raise FileNotFoundError(errno.ENOENT, "No such listings store", path)
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.db.close()
+
+    def apply_scrape(self, rows, now: int = None):
+        """
+        Upsert one scrape's rows in a single transaction. Of several rows for
+        one posting, the one util.listingRank ranks highest is kept (the
+        earliest on a tie), which is the row CategoryIndex keeps after
+        sortListings; it takes the position of the posting's first row.
+        Returns {"rows", "inserted", "updated"}.
+        """
+        from util import classifyJobCategory, listingRank
+
+        now = int(now or time.time())
+        kept = {}  # posting key -> index into params
+        params, ranks = [], []
+        for r in rows:
+            url = (r.get("url") or "").strip()
+            key = posting_key(url) if url else ""
+            if not key:
+                continue
+            i = kept.get(key)
+            rank = listingRank(r)
+            if i is not None and rank <= ranks[i]:
+                continue
+            if i is None:
+                i = kept[key] = len(params)
+                params.append(None)
+                ranks.append(None)
+            ranks[i] = rank
+            params[i] = (
+                key, url, r.get("company_name") or "", r.get("title") or "", classifyJobCategory(r),
+                int(r.get("date_posted") or 0), r.get("date_updated"), int(bool(r.get("active", True))),
+                int(bool(r.get("is_visible", True))), now, now, i, json.dumps(r, separators=(",", ":")),
+            )
+
+        with self.db:
+            before = self.count(current=False)
+            self.db.executemany(_UPSERT, params)
+            inserted = self.count(current=False) - before
+            stats = {"rows": len(params), "inserted": inserted, "updated": len(params) - inserted}
+            self.db.execute("INSERT OR REPLACE INTO scrapes (at, rows, inserted, updated) VALUES (?, ?, ?, ?)",
+                            (now, stats["rows"], stats["inserted"], stats["updated"]))
+        return stats
+
+    def last_scrape(self):
+        """Time of the latest applied scrape, or None."""
+        return self.db.execute("SELECT max(at) FROM scrapes").fetchone()[0]
+
+    def _where(self, current=True, active=None, visible=None, since=None, category=None, company=None):
+        clauses, args = [], []
+        if current:
+            clauses.append("last_seen = (SELECT max(at) FROM scrapes)")
+        if active is not None:
+            clauses.append("active = ?")
+            args.append(int(active))
+        if visible is not None:
+            clauses.append("is_visible = ?")
+            args.append(int(visible))
+        if since:
+            clauses.append("date_posted > ?")
+            args.append(int(since))
+        if category is not None:
+            clauses.append("category = ?")
+            args.append(category)
+        if company is not None:
+            clauses.append("company_name = ? COLLATE NOCASE")
+            args.append(company)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), args
+
+    def iter_listings(self, **filters):
+        """
+        Upstream rows matching the filters, in the order the scrape that
+        last saw them listed them (so readers see the upstream file's order).
+        Filters: current (default True), active, visible, since (date_posted
+        after this epoch time), category, company (case-insensitive).
+        """
+        where, args = self._where(**filters)
+        for (data,) in self.db.execute(f"SELECT data FROM listings{where} ORDER BY last_seen DESC, position", args):
+            yield json.loads(data)
+
+    def count(self, **filters):
+        where, args = self._where(**filters)
+        return self.db.execute(f"SELECT count(*) FROM listings{where}", args).fetchone()[0]
+
+def is_store(path: str) -> bool:
+    """Whether path names a listings store rather than a JSON file."""
+    return path.endswith((".db", ".sqlite", ".sqlite3"))
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the SQLite listings history.")
+    parser.add_argument("--db", default=DEFAULT_PATH, help="Store path")
+    commands = parser.add_subparsers(dest="command", required=True)
+    load = commands.add_parser("import", help="Apply a listings JSON array as one scrape")
+    load.add_argument("file")
+    commands.add_parser("stats", help="Row counts and the latest scrapes")
+    args = parser.parse_args()
+
+    with ListingStore(args.db) as store:
+        if args.command == "import":
+            start = time.perf_counter()
+            stats = store.apply_scrape(iter_file(args.file))
+            print(f"Applied {stats['rows']} postings ({stats['inserted']} new, {stats['updated']} updated) "
+                  f"in {time.perf_counter() - start:.2f}s")
+            return
+        print(f"{store.count(current=False)} postings seen, {store.count()} in the latest scrape, "
+              f"{store.count(active=True)} of them active")
+        for at, rows, inserted, updated in store.db.execute(
+                "SELECT at, rows, inserted, updated FROM scrapes ORDER BY at DESC LIMIT 5"):
+            print(f"  {time.strftime('%Y-%m-%d %H:%M', time.localtime(at))}: "
+                  f"{rows} postings, {inserted} new, {updated} updated")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Lightweight timers and counters for the scrape -> render -> sync pipeline.
+
+Off unless JOBS_METRICS is set when this module is first imported:
+
+    JOBS_METRICS=1             print a JSON summary to stderr at exit
+    JOBS_METRICS=metrics.json  write the summary to that file at exit
+
+With JOBS_METRICS_OUTPUT=1 the summary is also passed to util.setOutput
+as "metrics", so a GitHub Actions step can read it from GITHUB_OUTPUT.
+
+When disabled, @timed returns the function unchanged, timer() returns a
+shared no-op context manager and count() returns immediately, so
+instrumented code pays one attribute lookup and call at most.
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+import functools
+from contextlib import nullcontext
+
+from atomicfile import atomic_open
+
+_SETTING = os.getenv("JOBS_METRICS", "")
+enabled = _SETTING not in ("", "0")
+
+_lock = threading.Lock()
+_counters = {}
+_timers = {}   # name -> [calls, total seconds, max seconds]
+_NULL = nullcontext()
+
+def count(name, n=1):
+    """Add n to a counter."""
+    if not enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+def record(name, seconds):
+    """Add one timed call to a timer."""
+    with _lock:
+        stat = _timers.get(name)
+        if stat is None:
+            stat = _timers[name] = [0, 0.0, 0.0]
+        stat[0] += 1
+        stat[1] += seconds
+        if seconds > stat[2]:
+            stat[2] = seconds
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+
+def timer(name):
+    """Context manager that times its block under name."""
+    return _Timer(name) if enabled else _NULL
+
+def timed(name=None):
+    """Decorator form of timer(); a no-op when metrics are disabled."""
+    def decorate(fn):
+        if not enabled:
+            return fn
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(label, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+def counted(name, chunks):
+    """Pass chunks through, adding their total length to a counter."""
+    if not enabled:
+        return chunks
+
+    def passthrough():
+        total = 0
+        try:
+            for chunk in chunks:
+                total += len(chunk)
+                yield chunk
+        finally:
+            count(name, total)
+    return passthrough()
+
+def summary():
+    with _lock:
+        return {
+            "counters": dict(sorted(_counters.items())),
+            "timers": {
+                name: {"calls": calls, "total_s": round(total, 6), "max_s": round(peak, 6)}
+                for name, (calls, total, peak) in sorted(_timers.items())
+            },
+        }
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _timers.clear()
+
+def report():
+    """Emit the summary as configured by JOBS_METRICS and JOBS_METRICS_OUTPUT."""
+    data = summary()
+    if not data["counters"] and not data["timers"]:
+        return
+    if _SETTING == "1":
+        print(json.dumps(data, indent=2), file=sys.stderr)
+    else:
+        with atomic_open(_SETTING) as f:
+            json.dump(data, f, indent=2)
+    if os.getenv("JOBS_METRICS_OUTPUT") == "1":
+        from util import setOutput
+        setOutput("metrics", json.dumps(data, separators=(",", ":")))
+
+if enabled:
+    atexit.register(report)
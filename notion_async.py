@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Asyncio engine for bulk upserts into the Notion tracker.
+
+Same semantics as write_to_notion.upsert_job: a job is deduped by the link
+on its Name title (through the same local PageIndex), existing pages get
+their properties rewritten, and new ones are created with Status=Applied.
+All requests share one pooled httpx connection and one async token bucket.
+
+Index paging and page writes are pipelined: while the index is being
+reconciled, jobs the local index already knows are updated concurrently;
+the rest wait for the reconcile and are then updated or created. With
+lookup="property" there is no index: each job is one filtered query on
+URL_KEY_PROP followed by its write.
+"""
+import sys
+import time
+import random
+import asyncio
+import argparse
+
+import httpx
+from notion_client import AsyncClient, APIResponseError
+
+import metrics
+from canonical_url import posting_key
+from write_to_notion import (
+    INDEX_PATH, NOTION_RATE_LIMIT, MAX_RETRIES, URL_KEY_PROP, LOOKUP,
+    PageIndex, load_settings, build_props, read_jobs, upsert_stats, print_upsert_summary, _normalize_url, _url_key, _page_details, _page_gone,
+)
+
+class AsyncTokenBucket:
+    """Token bucket for coroutines: acquire() waits until a request may be sent."""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class AsyncNotionSync:
+    """
+    Holds the pooled client, rate limiter and page index for one run:
+
+        async with AsyncNotionSync() as sync:
+            results, stats = await sync.upsert_jobs(jobs)
+    """
+
+    def __init__(self, token: str = None, db_id: str = None, rate: float = NOTION_RATE_LIMIT,
+                 concurrency: int = 8, base_url: str = None, index_path: str = INDEX_PATH,
+                 lookup: str = LOOKUP):
+        if not token or not db_id:
+            default_token, default_db_id = load_settings()
+            token, db_id = token or default_token, db_id or default_db_id
+        self.token = token
+        self.db_id = db_id
+        self.lookup = lookup
+        self.limiter = AsyncTokenBucket(rate)
+        self.concurrency = max(1, concurrency)
+        self.base_url = base_url
+        self.index = PageIndex(index_path)
+        self.retry_count = 0
+        self.http = None
+        self.notion = None
+
+    async def __aenter__(self):
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        self.http = httpx.AsyncClient(limits=limits)
+        options = {"auth": self.token, "client": self.http}
+        if self.base_url:
+            options["base_url"] = self.base_url
+        self.notion = AsyncClient(**options)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.http.aclose()
+
+    async def call(self, fn, **kwargs):
+        """Async counterpart of write_to_notion.call_notion."""
+        name = f"notion.{getattr(fn, '__qualname__', 'call')}"
+        for attempt in range(MAX_RETRIES + 1):
+            await self.limiter.acquire()
+            metrics.count("notion.calls")
+            try:
+                with metrics.timer(name):
+                    return await fn(**kwargs)
+            except APIResponseError as e:
+                if e.status != 429 or attempt == MAX_RETRIES:
+                    metrics.count("notion.errors")
+                    raise
+                retry_after = e.headers.get("retry-after") if e.headers else None
+                delay = float(retry_after) if retry_after else 2 ** attempt
+                self.retry_count += 1
+                metrics.count("notion.retries")
+                await asyncio.sleep(delay + random.uniform(0, 0.5))
+
+    async def reconcile(self):
+        """Page through edits since the last run and fold them into the index."""
+        query = self.index.reconcile_query(self.db_id)
+        cursor = None
+        while True:
+            resp = await self.call(self.notion.databases.query, start_cursor=cursor, **query)
+            for page in resp.get("results", []):
+                self.index.apply_page(page)
+            if not resp.get("has_more"):
+                break
+            cursor = resp.get("next_cursor")
+        self.index.finish_reconcile()
+        self.index.save()
+
+    async def find_page_by_url_key(self, url: str):
+        resp = await self.call(
+            self.notion.databases.query,
+            database_id=self.db_id,
+            page_size=1,
+            filter={"property": URL_KEY_PROP, "rich_text": {"equals": posting_key(url)}},
+        )
+        results = resp.get("results", [])
+        return results[0] if results else None
+
+    async def upsert_job(self, company: str, url: str, role: str):
+        url = _normalize_url(url)
+        props = build_props(company, url, role)
+
+        if self.lookup == "property":
+            props[URL_KEY_PROP] = _url_key(url)
+            page = await self.find_page_by_url_key(url)
+            if page:
+                await self.call(self.notion.pages.update, page_id=page["id"], properties=props)
+                return ("updated", page["id"])
+            new_page = await self.call(self.notion.pages.create, parent={"database_id": self.db_id}, properties=props)
+            return ("created", new_page["id"])
+
+        page_id = self.index.get(url)
+        metrics.count("notion.index_hits" if page_id else "notion.index_misses")
+        if page_id:
+            try:
+                await self.call(self.notion.pages.update, page_id=page_id, properties=props)
+                return ("updated", page_id)
+            except APIResponseError as e:
+                # Deleted or trashed since the last full scan; fall through and recreate it
+                if not _page_gone(e):
+                    raise
+                self.index.discard(page_id)
+
+        new_page = await self.call(
+            self.notion.pages.create,
+            parent={"database_id": self.db_id},
+            properties=props
+        )
+        self.index.put(url, new_page["id"], _page_details(new_page))
+        return ("created", new_page["id"])
+
+    async def _update_known(self, job):
+        """Update a job the local index knows before the reconcile finishes; None defers it."""
+        page_id = self.index.get(job[1])
+        metrics.count("notion.index_hits")
+        try:
+            await self.call(self.notion.pages.update, page_id=page_id,
+                            properties=build_props(*job))
+            return ("updated", page_id)
+        except APIResponseError as e:
+            if e.status == 429:
+                raise
+            return None  # archived or deleted: retry once the index is current
+
+    async def upsert_jobs(self, jobs):
+        """
+        Upsert (company, url, role) jobs. Returns (results, stats) like
+        write_to_notion.upsert_jobs.
+        """
+        start = time.perf_counter()
+        retries_before = self.retry_count
+        jobs = [(company, _normalize_url(url), role) for company, url, role in jobs]
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def run(job, upsert):
+            async with slots:
+                t0 = time.perf_counter()
+                try:
+                    outcome = await upsert(job)
+                except Exception as e:
+                    outcome = ("failed", str(e))
+            return None if outcome is None else (job, *outcome, time.perf_counter() - t0)
+
+        done = {}
+        if self.lookup == "index":
+            # An index of another database is cleared by the reconcile, so nothing is known yet
+            known = [job for job in jobs if self.index.get(job[1])] if self.index.db_id == self.db_id else []
+            early = [asyncio.create_task(run(job, self._update_known)) for job in known]
+            try:
+                await self.reconcile()
+            except BaseException:
+                for task in early:
+                    task.cancel()
+                raise
+            for result in await asyncio.gather(*early):
+                if result is not None:
+                    done[result[0][1]] = result
+
+        rest = [job for job in jobs if job[1] not in done]
+        if self.lookup == "index":
+            print(f"{len(jobs)} jobs: {len(done)} written during the index sync, {len(rest)} after it")
+        later = await asyncio.gather(*(run(job, lambda j: self.upsert_job(*j)) for job in rest))
+        for result in later:
+            done[result[0][1]] = result
+        if self.lookup == "index":
+            self.index.save()
+
+        results = [done[job[1]] for job in jobs]
+        return results, upsert_stats(results, time.perf_counter() - start, self.retry_count - retries_before)
+
+async def upsert_jobs(jobs, concurrency: int = 8, rate: float = NOTION_RATE_LIMIT, **options):
+    async with AsyncNotionSync(rate=rate, concurrency=concurrency, **options) as sync:
+        return await sync.upsert_jobs(jobs)
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk add/update jobs in Notion over one pooled async connection.")
+    parser.add_argument("--file", required=True, help="JSON array or JSONL of jobs ('-' for stdin), or a listings store (.db)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight at once")
+    parser.add_argument("--rate", type=float, default=NOTION_RATE_LIMIT, help="Max requests per second")
+    parser.add_argument("--lookup", choices=("index", "property"), default=LOOKUP,
+                        help=f"Find existing pages via the local index or the {URL_KEY_PROP!r} property")
+    args = parser.parse_args()
+    try:
+        load_settings()
+    except RuntimeError as e:
+        sys.exit(f"ERROR: {e}")
+
+    jobs = read_jobs(args.file)
+    results, stats = asyncio.run(upsert_jobs(jobs, args.concurrency, args.rate, lookup=args.lookup))
+    print_upsert_summary(results, stats)
+
+if __name__ == "__main__":
+    main()
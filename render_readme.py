@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+import argparse
+
+import util
+from listings_store import is_store
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate the category tables in a README from the full listings.")
+    parser.add_argument("--listings", default=".cache/listings.raw.json",
+                        help="Full upstream listings (scraper.py caches them here), or a listings store (.db)")
+    parser.add_argument("--readme", default="README.md", help="README with Browse and TABLE_START/TABLE_END sections")
+    parser.add_argument("--off-season", action="store_true", help="Render Fall/Winter/Spring roles instead of Summer")
+    parser.add_argument("--year", default="2026", help="Summer term to include")
+    parser.add_argument("--since", type=int, default=0, help="Only include listings posted after this epoch time")
+    parser.add_argument("--cache", help="Incremental render cache file, e.g. .cache/readme_render.json")
+    parser.add_argument("--workers", type=int, default=1, help="Render categories on this many processes")
+    parser.add_argument("--quarantine", help="Set listings that fail the schema check aside in this file instead of failing")
+    parser.add_argument("--shard", action="store_true", help="Write each category to its own size-limited pages and link them from the README")
+    args = parser.parse_args()
+
+    # From a store, only visible listings (posted after --since for Summer) are read
+    from_store = is_store(args.listings)
+    store_filters = {"visible": True, "since": 0 if args.off_season else args.since}
+    if args.quarantine:
+        validator = util.SchemaValidator()
+        rows = (util.iterListingsFromStore(args.listings, **store_filters) if from_store
+                else util.iterListingsFromJSON(args.listings))
+        listings = list(validator.filter(rows))
+        print(f"Received {validator.checked} listings, {validator.invalid} quarantined in {args.quarantine}")
+        if validator.invalid:
+            print(validator.report())
+        validator.saveQuarantine(args.quarantine)
+        util.setOutput("quarantined", validator.invalid)
+    else:
+        listings = (util.getListingsFromStore(args.listings, **store_filters) if from_store
+                    else util.getListingsFromJSON(args.listings))
+        util.checkSchema(listings)
+    if args.off_season:
+        listings = util.filterOffSeason(listings)
+    else:
+        listings = util.filterSummer(listings, args.year, args.since)
+    util.sortListings(listings)
+    util.embedTable(listings, args.readme, args.off_season, args.cache, args.workers, args.shard)
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,180 @@
-import json, time, requests
+import os, json, time, hashlib, argparse
+from jsonstream import iter_array, iter_file, dump_array, CHUNK_SIZE
+from atomicfile import atomic_open, write_atomic
+import metrics
+from canonical_url import UrlHashSet
+import listings_store
 
 RAW_URL = "https://raw.githubusercontent.com/SimplifyJobs/Summer2026-Internships/dev/.github/scripts/listings.json"
 
-def fetch_listings():
-    r = requests.get(RAW_URL, timeout=30)
-    r.raise_for_status()
-    return r.json()
+# Conditional-fetch cache: validators + URL fingerprints of the last snapshot
+CACHE_DIR  = ".cache"
+META_FILE  = "listings.meta.json"   # etag, last_modified, {url: fingerprint}
+RAW_FILE   = "listings.raw.json"    # last upstream body, served again on 304
+DELTA_FILE = "listings.delta.json"  # added/changed/removed from the last fetch
 
-def dedupe_by_url(rows):
-    seen, out = set(), []
+@metrics.timed("scraper.fetch_listings")
+def fetch_listings(url=RAW_URL, cache_dir=None):
+    if cache_dir:
+        rows, _ = fetch_listings_delta(url, cache_dir)
+    else:
+        rows = iter_listings(url)
+    return list(rows)
+
+def iter_listings(url=RAW_URL):
+    """Stream listings one at a time from the HTTP response body."""
+    import requests
+    with requests.get(url, timeout=30, stream=True) as r:
+        r.raise_for_status()
+        fetched = 0
+        for row in iter_array(metrics.counted("scraper.bytes_downloaded", r.iter_content(CHUNK_SIZE))):
+            fetched += 1
+            yield row
+        metrics.count("scraper.rows_fetched", fetched)
+
+def _fingerprint(row):
+    return hashlib.sha1(json.dumps(row, sort_keys=True).encode()).hexdigest()[:16]
+
+def _load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path) as f:
+        return json.load(f)
+
+def _tee(chunks, f):
+    for chunk in chunks:
+        f.write(chunk)
+        yield chunk
+
+def diff_listings(old_prints, rows):
+    """
+    Compare rows against {url: fingerprint} of the previous snapshot.
+    Returns (new_prints, delta) where delta holds the added and changed rows
+    and the URLs that disappeared.
+    """
+    new_prints, added, changed = {}, [], []
+    fetched = 0
     for r in rows:
+        fetched += 1
         url = (r.get("url") or "").strip()
-        if not url or url in seen:
+        if not url or url in new_prints:
             continue
-        seen.add(url)
-        out.append({
+        fp = new_prints[url] = _fingerprint(r)
+        if url not in old_prints:
+            added.append(r)
+        elif old_prints[url] != fp:
+            changed.append(r)
+    removed = [url for url in old_prints if url not in new_prints]
+    metrics.count("scraper.rows_fetched", fetched)
+    return new_prints, {"added": added, "changed": changed, "removed": removed}
+
+@metrics.timed("scraper.fetch_listings_delta")
+def fetch_listings_delta(url=RAW_URL, cache_dir=CACHE_DIR):
+    """
+    Conditionally fetch the listings, sending the ETag/Last-Modified stored
+    from the previous run. Returns (rows, delta); an unchanged upstream costs
+    one 304 and yields an empty delta. The delta is also written to
+    DELTA_FILE for downstream steps.
+
+    The body is streamed to the cache while it is diffed, and rows is a
+    generator over the cached copy, so only the delta is held in memory.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    meta_path = os.path.join(cache_dir, META_FILE)
+    raw_path = os.path.join(cache_dir, RAW_FILE)
+    meta = _load_json(meta_path, {})
+    if meta.get("url") != url or not os.path.exists(raw_path):
+        meta = {}
+
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    import requests
+    with requests.get(url, headers=headers, timeout=30, stream=True) as r:
+        not_modified = r.status_code == 304
+        if not_modified:
+            metrics.count("scraper.not_modified")
+            delta = {"added": [], "changed": [], "removed": []}
+        else:
+            r.raise_for_status()
+            with atomic_open(raw_path, "wb") as f:
+                chunks = metrics.counted("scraper.bytes_downloaded", r.iter_content(CHUNK_SIZE))
+                rows = iter_array(_tee(chunks, f))
+                prints, delta = diff_listings(meta.get("fingerprints", {}), rows)
+
+    if not not_modified:
+        meta = {
+            "url": url,
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+            "fetched_at": int(time.time()),
+            "fingerprints": prints,
+        }
+        write_atomic(meta_path, json.dumps(meta).encode())
+
+    delta["not_modified"] = not_modified
+    write_atomic(os.path.join(cache_dir, DELTA_FILE), json.dumps(delta).encode())
+    return iter_file(raw_path), delta
+
+def iter_dedupe_by_url(rows, seen=None):
+    """
+    Keep the first row for each posting, comparing canonical URL hashes so
+    tracking parameters, host case and alternate ATS links don't count as
+    new postings. Pass a UrlHashSet as seen to dedupe across runs.
+    """
+    seen = UrlHashSet() if seen is None else seen
+    kept = dropped = 0
+    for r in rows:
+        url = (r.get("url") or "").strip()
+        if not url or not seen.add(url):
+            dropped += 1
+            continue
+        kept += 1
+        yield {
             "company_name": r.get("company_name"),
             "title":        r.get("title"),
             "url":          url,
             "date_posted":  r.get("date_posted"),
             "active":       r.get("active", True),
-        })
-    return out
+        }
+    metrics.count("dedupe_by_url.rows_in", kept + dropped)
+    metrics.count("dedupe_by_url.rows_out", kept)
+
+@metrics.timed("scraper.dedupe_by_url")
+def dedupe_by_url(rows, seen=None):
+    return list(iter_dedupe_by_url(rows, seen))
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch the upstream listings and record them.")
+    parser.add_argument("--db", default=listings_store.DEFAULT_PATH, help="Listings store to apply the scrape to")
+    parser.add_argument("--json", metavar="PATH", help="Also write the deduped rows as a JSON snapshot (e.g. listings.json)")
+    parser.add_argument("--url", default=RAW_URL, help="Listings JSON to fetch")
+    args = parser.parse_args()
+
+    rows, delta = fetch_listings_delta(args.url)
+    raw_path = os.path.join(CACHE_DIR, RAW_FILE)
+    if delta["not_modified"]:
+        print("upstream unchanged (304)")
+    else:
+        print(f"delta: +{len(delta['added'])} ~{len(delta['changed'])} -{len(delta['removed'])}")
+        with listings_store.ListingStore(args.db) as store, metrics.timer("scraper.apply_scrape"):
+            stats = store.apply_scrape(rows)
+        print(f"{args.db}: {stats['rows']} postings, {stats['inserted']} new, {stats['updated']} updated")
+        if args.json:
+            # iter_dedupe_by_url is lazy, so the timer covers the loop that consumes it
+            with open(args.json, "w") as f, metrics.timer("scraper.dedupe_by_url"):
+                total = dump_array(iter_dedupe_by_url(iter_file(raw_path)), f)
+            print("total:", total)
+
+    # Refresh the search index next to the cached snapshot (see search_index.py)
+    from search_index import SearchIndex, indexPath
+    if not delta["not_modified"] or not os.path.exists(indexPath(raw_path)):
+        index = SearchIndex.build_file(raw_path)
+        index.save(indexPath(raw_path))
+        print(f"search index: {len(index)} postings")
 
 if __name__ == "__main__":
-    rows = fetch_listings()
-    rows = dedupe_by_url(rows)
-    print("total:", len(rows))
-    # (optional) write to a local file your bot can use
-    with open("listings.json", "w") as f:
-        json.dump(rows, f, indent=2)
\ No newline at end of file
+    main()
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Inverted index over a listings snapshot, for picking jobs to send to Notion.
+
+build() tokenizes each posting's title and company, normalizes its
+locations (with aliases such as "nyc" and "sf"), terms and category
+(util.classifyJobCategory), and keeps one sorted posting list per token
+and field. The index is saved next to the snapshot (listings.raw.json ->
+listings.raw.index.json) and rebuilt when the snapshot is newer.
+
+Queries are boolean: AND (also implied between words), OR, NOT and
+parentheses; word* matches a prefix; field:word restricts a word to
+title, company, location, term or category; "active"/"inactive" filter on
+the flag and "posted < 7d" (or >, and h, w, mo) on age. Postings are
+combined as int bitmaps, and documents are stored newest first, so an age
+filter is a single mask.
+
+    python search_index.py build [--listings FILE]
+    python search_index.py query "quant AND nyc AND active AND posted < 7d"
+    python search_index.py query "soft* AND (sf OR remote)" | python write_to_notion.py --file -
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from bisect import bisect_left, bisect_right
+
+import util
+from atomicfile import atomic_open
+from canonical_url import UrlHashSet
+from jsonstream import iter_file
+
+VERSION = 1
+DEFAULT_LISTINGS = ".cache/listings.raw.json"
+FIELDS = ("title", "company", "location", "term", "category")
+# Columns kept per document, in order; query output uses these keys
+DOC_KEYS = ("company_name", "title", "url", "date_posted", "active", "category", "locations", "terms")
+
+# Extra tokens for common ways of writing a place
+LOCATION_ALIASES = {
+    "new york": "nyc", "nyc": "nyc", "manhattan": "nyc", "brooklyn": "nyc",
+    "san francisco": "sf", "bay area": "sf",
+    "los angeles": "la", "washington, dc": "dc", "washington dc": "dc",
+    "remote": "remote",
+}
+CATEGORY_KEYS = {info["name"]: key for key, info in util.CATEGORIES.items()}
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_QUERY_TOKEN = re.compile(
+    r"\s*(?:(?P<age>posted\s*(?P<cmp>[<>])\s*(?P<n>\d+)\s*(?P<unit>mo|[hdw]))"
+    r"|(?P<paren>[()])|(?P<word>[^\s()]+))",
+    re.IGNORECASE,
+)
+_UNIT_SECONDS = {"h": 3600, "d": 86400, "w": 7 * 86400, "mo": 30 * 86400}
+# Postings covering at least 1/DENSE_FRACTION of the docs are saved as bitmaps
+DENSE_FRACTION = 16
+
+class QueryError(ValueError):
+    pass
+
+def tokenize(text):
+    return _TOKEN.findall((text or "").lower())
+
+def locationTokens(location):
+    lowered = location.lower()
+    tokens = set(tokenize(lowered))
+    tokens.update(alias for phrase, alias in LOCATION_ALIASES.items() if phrase in lowered)
+    return tokens
+
+def indexPath(listings_path):
+    return os.path.splitext(listings_path)[0] + ".index.json"
+
+# Bit positions set in each byte value, for turning a bitmap back into ids
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+def encodePostings(ids, size):
+    """Sorted doc ids as saved: a list if sparse, else a hex bitmap (one bit per doc)."""
+    if len(ids) * DENSE_FRACTION < size:
+        return ids
+    return format(idsToBits(ids, size), "x")
+
+def idsToBits(ids, size):
+    bits = bytearray((size + 7) // 8)
+    for i in ids:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, "little")
+
+def bitsToIds(bits, size):
+    return [i * 8 + bit for i, byte in enumerate(bits.to_bytes((size + 7) // 8, "little")) if byte
+            for bit in _BYTE_BITS[byte]]
+
+class SearchIndex:
+    """
+    docs holds one row per posting (DOC_KEYS), newest first. fields maps a
+    field name to {token: postings} and active holds the active postings,
+    both as encodePostings() writes them. Queries combine postings as int
+    bitmaps (bit i is doc i), decoded on first use.
+    """
+
+    def __init__(self, docs=None, fields=None, active=None, built_at=0, source=None):
+        self.docs = docs or []
+        self.fields = fields or {field: {} for field in FIELDS}
+        self.active = active if active is not None else []
+        self.built_at = built_at
+        self.source = source
+        self._dates = [-doc[3] for doc in self.docs]   # ascending, for bisect
+        self._all = (1 << len(self.docs)) - 1
+        self._vocab = {}   # field -> sorted tokens, built on first prefix query
+        self._bitmaps = {}  # (field, token) -> int bitmap
+
+    @classmethod
+    def build(cls, rows, source=None):
+        docs = []
+        seen = UrlHashSet()
+        for r in rows:
+            url = (r.get("url") or "").strip()
+            if not url or not seen.add(url):
+                continue
+            docs.append((
+                r.get("company_name") or "", r.get("title") or "", url, int(r.get("date_posted") or 0),
+                bool(r.get("active", True)), util.classifyJobCategory(r),
+                list(r.get("locations") or []), list(r.get("terms") or []),
+            ))
+        docs.sort(key=lambda doc: doc[3], reverse=True)
+
+        fields = {field: {} for field in FIELDS}
+        def add(field, tokens, doc_id):
+            postings = fields[field]
+            for token in tokens:
+                ids = postings.get(token)
+                if ids is None:
+                    postings[token] = [doc_id]
+                elif ids[-1] != doc_id:
+                    ids.append(doc_id)
+
+        for doc_id, (company, title, _, _, _, category, locations, terms) in enumerate(docs):
+            add("title", tokenize(title), doc_id)
+            add("company", tokenize(company), doc_id)
+            for location in locations:
+                add("location", locationTokens(location), doc_id)
+            for term in terms:
+                add("term", tokenize(term), doc_id)
+            if category:
+                add("category", tokenize(category) + tokenize(CATEGORY_KEYS.get(category, "")), doc_id)
+
+        size = len(docs)
+        fields = {field: {token: encodePostings(ids, size) for token, ids in postings.items()}
+                  for field, postings in fields.items()}
+        active = encodePostings([doc_id for doc_id, doc in enumerate(docs) if doc[4]], size)
+        return cls(docs, fields, active, int(time.time()), source)
+
+    @classmethod
+    def build_file(cls, listings_path):
+        return cls.build(iter_file(listings_path), source=os.path.abspath(listings_path))
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("version") != VERSION:
+            raise ValueError(f"{path} was written by a different version of search_index.py")
+        docs = [tuple(doc) for doc in data["docs"]]
+        return cls(docs, data["fields"], data["active"], data["built_at"], data.get("source"))
+
+    def save(self, path):
+        data = {"version": VERSION, "built_at": self.built_at, "source": self.source,
+                "docs": self.docs, "fields": self.fields, "active": self.active}
+        with atomic_open(path) as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    def __len__(self):
+        return len(self.docs)
+
+    # Query evaluation: every node evaluates to an int bitmap of doc ids
+
+    def _decode(self, postings):
+        if isinstance(postings, str):
+            return int(postings, 16)
+        return idsToBits(postings, len(self.docs))
+
+    def _bits(self, field, token):
+        key = (field, token)
+        bits = self._bitmaps.get(key)
+        if bits is None:
+            postings = self.active if field is None else self.fields[field].get(token, ())
+            bits = self._bitmaps[key] = self._decode(postings)
+        return bits
+
+    def _prefix(self, field, prefix):
+        vocab = self._vocab.get(field)
+        if vocab is None:
+            vocab = self._vocab[field] = sorted(self.fields[field])
+        bits = 0
+        i = bisect_left(vocab, prefix)
+        while i < len(vocab) and vocab[i].startswith(prefix):
+            bits |= self._bits(field, vocab[i])
+            i += 1
+        return bits
+
+    def _word(self, word):
+        field, sep, value = word.lower().partition(":")
+        if not sep:
+            field, value = None, field
+        elif field not in FIELDS:
+            raise QueryError(f"unknown field {field!r}; use one of {', '.join(FIELDS)}")
+        if field is None and value in ("active", "inactive"):
+            active = self._bits(None, "active")
+            return active if value == "active" else self._all ^ active
+        prefix = value.endswith("*")
+        tokens = tokenize(value)
+        if not tokens:
+            raise QueryError(f"nothing to search for in {word!r}")
+        bits = self._all
+        for n, token in enumerate(tokens):
+            is_prefix = prefix and n == len(tokens) - 1
+            matches = 0
+            for f in (field,) if field else FIELDS:
+                matches |= self._prefix(f, token) if is_prefix else self._bits(f, token)
+            bits &= matches
+        return bits
+
+    def _age(self, cmp, n, unit, now):
+        cutoff = now - int(n) * _UNIT_SECONDS[unit.lower()]
+        newer = bisect_right(self._dates, -cutoff)  # docs[:newer] were posted at or after cutoff
+        recent = (1 << newer) - 1
+        return recent if cmp == "<" else self._all ^ recent
+
+    def search(self, query, now=None):
+        """Doc ids matching query, newest first."""
+        now = now or time.time()
+        tokens = self._lex(query)
+        pos = 0
+
+        def peek():
+            return tokens[pos] if pos < len(tokens) else None
+
+        def take():
+            nonlocal pos
+            pos += 1
+            return tokens[pos - 1]
+
+        def parse_or():
+            bits = parse_and()
+            while peek() == ("op", "OR"):
+                take()
+                bits = bits | parse_and()
+            return bits
+
+        def parse_and():
+            bits = parse_not()
+            while peek() is not None and peek() not in (("op", "OR"), ("paren", ")")):
+                if peek() == ("op", "AND"):
+                    take()
+                bits = bits & parse_not()
+            return bits
+
+        def parse_not():
+            if peek() == ("op", "NOT"):
+                take()
+                return self._all ^ parse_not()
+            return parse_atom()
+
+        def parse_atom():
+            token = take() if peek() is not None else None
+            if token is None:
+                raise QueryError("query ends too early")
+            kind, value = token
+            if kind == "paren" and value == "(":
+                bits = parse_or()
+                if peek() != ("paren", ")"):
+                    raise QueryError("missing )")
+                take()
+                return bits
+            if kind == "age":
+                return self._age(*value, now)
+            if kind == "word":
+                return self._word(value)
+            raise QueryError(f"unexpected {value!r}")
+
+        bits = parse_or()
+        if pos != len(tokens):
+            raise QueryError(f"unexpected {tokens[pos][1]!r}")
+        return bitsToIds(bits, len(self.docs))
+
+    @staticmethod
+    def _lex(query):
+        tokens, pos = [], 0
+        query = query.rstrip()
+        while pos < len(query):
+            m = _QUERY_TOKEN.match(query, pos)
+            if not m:
+                raise QueryError(f"cannot parse {query[pos:]!r}")
+            pos = m.end()
+            if m.group("age"):
+                tokens.append(("age", (m.group("cmp"), m.group("n"), m.group("unit"))))
+            elif m.group("paren"):
+                tokens.append(("paren", m.group("paren")))
+            elif m.group("word") in ("AND", "OR", "NOT"):
+                tokens.append(("op", m.group("word")))
+            else:
+                tokens.append(("word", m.group("word")))
+        return tokens
+
+    def listing(self, doc_id):
+        return dict(zip(DOC_KEYS, self.docs[doc_id]))
+
+def load_or_build(listings_path, path=None):
+    """The saved index for listings_path, rebuilt first if missing or older than the snapshot."""
+    path = path or indexPath(listings_path)
+    if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(listings_path):
+        try:
+            return SearchIndex.load(path)
+        except (ValueError, KeyError):
+            pass
+    index = SearchIndex.build_file(listings_path)
+    index.save(path)
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the search index over a listings snapshot.")
+    parser.add_argument("--listings", default=DEFAULT_LISTINGS, help="Listings snapshot (JSON array)")
+    parser.add_argument("--index", help="Index file (default: next to the snapshot)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("build", help="(Re)build the index and save it")
+    query = commands.add_parser("query", help="Print matching listings as JSONL, newest first")
+    query.add_argument("query", nargs="+", help='e.g. "quant AND nyc AND active AND posted < 7d"')
+    query.add_argument("--limit", type=int, default=0, help="Print at most this many")
+    query.add_argument("--count", action="store_true", help="Only print the number of matches")
+    args = parser.parse_args()
+    path = args.index or indexPath(args.listings)
+
+    if args.command == "build":
+        start = time.perf_counter()
+        index = SearchIndex.build_file(args.listings)
+        index.save(path)
+        tokens = sum(len(postings) for postings in index.fields.values())
+        print(f"Indexed {len(index)} postings, {tokens} tokens in {time.perf_counter() - start:.2f}s -> {path}",
+              file=sys.stderr)
+        return
+
+    index = load_or_build(args.listings, path)
+    start = time.perf_counter()
+    try:
+        ids = index.search(" ".join(args.query))
+    except QueryError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - start
+    if args.count:
+        print(len(ids))
+    else:
+        for doc_id in ids[:args.limit or None]:
+            print(json.dumps(index.listing(doc_id)))
+    print(f"{len(ids)} of {len(index)} postings match ({elapsed * 1000:.2f} ms)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
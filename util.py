@@ -1,12 +1,49 @@
 import re
+import sys
 import json
 import os
-from datetime import datetime
-import time
-
-# Set the TZ environment variable to PST
-os.environ['TZ'] = 'America/Los_Angeles'
-time.tzset()
+import hashlib
+import tempfile
+import contextlib
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from array import array
+from functools import lru_cache
+from jsonstream import iter_file, dump_array
+from atomicfile import atomic_open
+import metrics
+from canonical_url import UrlHashSet
+
+# numpy is optional (it speeds up daysSince) and only imported on first use
+np = None
+_numpy_checked = False
+
+def _numpy():
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            pass
+    return np
+
+# Dates and ages are in Pacific time; passed explicitly rather than by
+# changing the process timezone
+TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+def localNow():
+    """The current Pacific time as a naive datetime."""
+    return datetime.now(TIMEZONE).replace(tzinfo=None)
+
+def localFromTimestamp(ts):
+    """An epoch time as a naive Pacific datetime."""
+    return datetime.fromtimestamp(ts, TIMEZONE).replace(tzinfo=None)
+
+def utcOffset(ts):
+    """Pacific UTC offset in seconds at an epoch time."""
+    return int(datetime.fromtimestamp(ts, TIMEZONE).utcoffset().total_seconds())
 
 # SIMPLIFY_BUTTON = "https://i.imgur.com/kvraaHg.png"
 SIMPLIFY_BUTTON = "https://i.imgur.com/MXdpmi0.png" # says apply
@@ -31,6 +68,9 @@ FAANG_PLUS = {
     "visa","waymo", "x"
 }
 
+# Order categories appear in the Browse section and the README tables
+CATEGORY_ORDER = ["Software", "Product", "AI/ML/Data", "Quant", "Hardware"]
+
 CATEGORIES = {
     "Software": {"name": "Software Engineering", "emoji": "💻"},
     "Product": {"name": "Product Management", "emoji": "📱"},
@@ -88,26 +128,78 @@ def getLink(listing):
         f'</div>'
     )
     
-def mark_stale_listings(listings):
-    now = datetime.now()
+_EPOCH = datetime(1970, 1, 1)
+_US = timedelta(microseconds=1)
+_OFFSET_BUCKET = 900  # UTC offsets only change on quarter-hour boundaries
+
+def daysSince(posted, now):
+    """
+    (now - localFromTimestamp(ts)).days for every epoch time in posted,
+    as one batch. Local UTC offsets are looked up once per quarter hour
+    touched rather than once per row; the arithmetic is exact integer math.
+    """
+    now_us = (now.replace(tzinfo=None) - _EPOCH) // _US
+    np = _numpy()
+    if np is not None:
+        ts = np.asarray(posted, dtype=np.int64)
+        buckets, inverse = np.unique(ts // _OFFSET_BUCKET, return_inverse=True)
+        table = np.array([utcOffset(int(b) * _OFFSET_BUCKET) for b in buckets], dtype=np.int64)
+        local = ts + table[inverse.reshape(-1)]
+        return (now_us - local * 1_000_000) // 86_400_000_000
+
+    days, offsets = array("q"), {}
+    for ts in posted:
+        bucket = ts // _OFFSET_BUCKET
+        offset = offsets.get(bucket)
+        if offset is None:
+            offset = offsets[bucket] = utcOffset(bucket * _OFFSET_BUCKET)
+        days.append((now_us - (ts + offset) * 1_000_000) // 86_400_000_000)
+    return days
+
+def computeAges(listings, now=None):
+    """
+    Store days since posting (clamped at 0) on every listing as
+    listing["days_active"], computed in one batch against a single "now".
+    Stale-marking and the Age column both read it, so call this once per render.
+    """
+    now = now or localNow()
+    days = daysSince([listing["date_posted"] for listing in listings], now)
+    if _numpy() is not None:
+        days = days.clip(0).tolist()
+    for listing, days_active in zip(listings, days):
+        listing["days_active"] = days_active if days_active > 0 else 0
+    return listings
+
+def staleAfterDays(source):
+    """Age in days at which a listing from source is marked inactive."""
+    if source == "Simplify":
+        return SIMPLIFY_INACTIVE_THRESHOLD_MONTHS * 30
+    return NON_SIMPLIFY_INACTIVE_THRESHOLD_MONTHS * 30
+
+def isStale(listing):
+    # Reads the age stored by computeAges
+    return listing["days_active"] >= staleAfterDays(listing["source"])
+
+def mark_stale_listings(listings, now=None):
+    computeAges(listings, now)
     for listing in listings:
-        age_in_months = (now - datetime.fromtimestamp(listing["date_posted"])).days / 30
-        if listing["source"] != "Simplify" and age_in_months >= NON_SIMPLIFY_INACTIVE_THRESHOLD_MONTHS:
-                listing["active"] = False
-        elif listing["source"] == "Simplify" and age_in_months >= SIMPLIFY_INACTIVE_THRESHOLD_MONTHS:
+        if isStale(listing):
             listing["active"] = False
     return listings
 
 def filter_active(listings):
     return [listing for listing in listings if listing.get("active", False)]
 
+_BOLD_RE = re.compile(r'\*\*(.*?)\*\*')
+_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+
 def convert_markdown_to_html(text):
     """Convert markdown formatting to HTML for proper rendering in HTML table cells"""
     # Convert **bold** to <strong>bold</strong>
-    text = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', text)
+    text = _BOLD_RE.sub(r'<strong>\1</strong>', text)
     
     # Convert [link text](url) to <a href="url">link text</a>
-    text = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2">\1</a>', text)
+    text = _LINK_RE.sub(r'<a href="\2">\1</a>', text)
     
     return text
 
@@ -123,180 +215,321 @@ th { text-align: left; font-weight: bold; }
 
 """
 
-def create_md_table(listings, offSeason=False):
-    # Create clean HTML table with minimal styling
-    table = '<table>\n<thead>\n<tr>\n'
-    
-    if offSeason:
-        table += '<th>Company</th>\n'
-        table += '<th>Role</th>\n'
-        table += '<th>Location</th>\n'
-        table += '<th>Terms</th>\n'
-        table += '<th>Application</th>\n'
-        table += '<th>Age</th>\n'
+# Characters that make convert_markdown_to_html do more than wrap the company cell
+_MARKDOWN_CHARS = frozenset("*[]()\n")
+ADVANCED_DEGREE_TERMS = ("master's", "masters", "master", "mba", "phd", "ph.d", "doctorate", "doctoral")
+
+def getCompanyCell(company_name, raw_url, faang=None):
+    company_url = raw_url + '?utm_source=GHList&utm_medium=company' if raw_url.startswith("http") else ""
+    if company_name and _MARKDOWN_CHARS.isdisjoint(company_name) and _MARKDOWN_CHARS.isdisjoint(company_url):
+        # Same HTML convert_markdown_to_html produces for plain names and URLs
+        if company_url:
+            company = f'<strong><a href="{company_url}">{company_name}</a></strong>'
+        else:
+            company = f"<strong>{company_name}</strong>"
     else:
-        table += '<th>Company</th>\n'
-        table += '<th>Role</th>\n'
-        table += '<th>Location</th>\n'
-        table += '<th>Application</th>\n'
-        table += '<th>Age</th>\n'
-    
-    table += '</tr>\n</thead>\n<tbody>\n'
+        company_markdown = f"**[{company_name}]({company_url})**" if company_url else f"**{company_name}**"
+        company = convert_markdown_to_html(company_markdown)
+
+    # Add fire emoji outside the link for FAANG+ companies
+    if faang is None:
+        faang = company_name.lower() in FAANG_PLUS
+    if faang:
+        company = f"🔥 {company}"
+    return company
+
+class CompanyStats:
+    __slots__ = ("name", "lower", "url", "oldest", "newest", "count", "faang")
+
+    def __init__(self, name, listing):
+        self.name = name
+        self.lower = sys.intern(name.lower())
+        self.url = listing["company_url"]
+        self.oldest = self.newest = listing["date_posted"]
+        self.count = 1
+        self.faang = self.lower in FAANG_PLUS
+
+class CompanyIndex:
+    """
+    Per-company aggregates built in one pass over the listings: the
+    lowercased name, the company_url all of the company's listings are shown
+    with (the last non-empty one), the oldest and newest date_posted, the
+    listing count and the FAANG_PLUS flag. sortListings sorts with it, and
+    the table renderers reuse its company cells across tables. Names the
+    index has not seen still get a cell, computed the old way.
+    """
+
+    def __init__(self):
+        self.companies = {}  # company name -> CompanyStats
+        self.cells = {}      # (company name, stripped company_url) -> company cell HTML
+
+    @classmethod
+    def build(cls, listings):
+        index = cls()
+        companies = index.companies
+        for listing in listings:
+            name = listing["company_name"]
+            stats = companies.get(name)
+            if stats is None:
+                companies[name] = CompanyStats(name, listing)
+                continue
+            date_posted = listing["date_posted"]
+            if date_posted < stats.oldest:
+                stats.oldest = date_posted
+            elif date_posted > stats.newest:
+                stats.newest = date_posted
+            if listing["company_url"]:
+                stats.url = listing["company_url"]
+            stats.count += 1
+        return index
+
+    def get(self, company_name):
+        return self.companies.get(company_name)
+
+    def cell(self, company_name, raw_url):
+        key = (company_name, raw_url)
+        company = self.cells.get(key)
+        if company is None:
+            stats = self.companies.get(company_name)
+            company = self.cells[key] = getCompanyCell(company_name, raw_url, stats.faang if stats else None)
+        return company
+
+def getPosition(listing):
+    # Check for advanced degree requirements and add graduation cap emoji
+    title = listing["title"]
+    needs_cap = False
+
+    # Check degrees field for advanced degree requirements
+    degrees = listing.get("degrees", [])
+    if degrees:
+        # Check if only advanced degrees are required (no Bachelor's or Associate's)
+        lowered = [degree.lower() for degree in degrees]
+        has_bachelors_or_associates = any(d in ("bachelor's", "associate's") for d in lowered)
+        has_advanced_degrees = any(d in ("master's", "phd", "mba") for d in lowered)
+        needs_cap = has_advanced_degrees and not has_bachelors_or_associates
+
+    # Also check title text for degree mentions
+    if not needs_cap and "🎓" not in title:
+        title_lower = title.lower()
+        needs_cap = any(term in title_lower for term in ADVANCED_DEGREE_TERMS)
+
+    if needs_cap:
+        title += " 🎓"
+    return title + getSponsorship(listing)
+
+def getDaysActive(listing, now):
+    # Prefer the age computeAges stored for this render
+    days_active = listing.get("days_active")
+    if days_active is None:
+        days_active = (now - localFromTimestamp(listing["date_posted"])).days
+    return max(days_active, 0)  # in case somehow negative
+
+def getTableRow(listing, company, days_active, offSeason=False):
+    days_display = (
+        "0d" if days_active == 0 else
+        f"{(days_active // 30)}mo" if days_active > 30 else
+        f"{days_active}d"
+    )
+    # Create HTML table row
+    row = f'<tr>\n<td>{company}</td>\n<td>{getPosition(listing)}</td>\n<td>{getLocations(listing)}</td>\n'
+    if offSeason:
+        row += f'<td>{", ".join(listing["terms"])}</td>\n'
+    return row + f'<td>{getLink(listing)}</td>\n<td>{days_display}</td>\n</tr>\n'
+
+TABLE_FOOTER = '</tbody>\n</table>\n'
 
+def getTableHeader(offSeason=False):
+    header = '<table>\n<thead>\n<tr>\n<th>Company</th>\n<th>Role</th>\n<th>Location</th>\n'
+    if offSeason:
+        header += '<th>Terms</th>\n'
+    return header + '<th>Application</th>\n<th>Age</th>\n</tr>\n</thead>\n<tbody>\n'
+
+def renderRow(listing, company, days_active, offSeason=False, cache=None):
+    if cache is None:
+        return getTableRow(listing, company, days_active, offSeason)
+    row_key = f"{cache.fingerprint(listing)}:{offSeason:d}:{days_active}:{company == '↳':d}"
+    return cache.row(row_key, lambda: getTableRow(listing, company, days_active, offSeason))
+
+def iterTableRows(listings, offSeason=False, now=None, cache=None, companies=None):
+    """
+    Yield (row_html, listing, days_active, collapsed) for each listing, where
+    collapsed rows show "↳" instead of repeating the company above them.
+    Company cells come from companies (a CompanyIndex) when given, so they
+    are shared with other tables of the same render.
+    """
+    now = now or localNow()
+    companies = companies if companies is not None else CompanyIndex()
     prev_company = None
     prev_days_active = None  # FIXED: previously incorrectly using date_posted
 
     for listing in listings:
-        # Check if this is a FAANG+ company for fire emoji
         company_name = listing["company_name"]
-        is_faang_plus = company_name.lower() in FAANG_PLUS
-        
-        raw_url = listing.get("company_url", "").strip()
-        company_url = raw_url + '?utm_source=GHList&utm_medium=company' if raw_url.startswith("http") else ""
-        company_markdown = f"**[{company_name}]({company_url})**" if company_url else f"**{company_name}**"
-        
-        # Add fire emoji outside the link for FAANG+ companies
-        if is_faang_plus:
-            company_markdown = f"🔥 {company_markdown}"
-        
-        company = convert_markdown_to_html(company_markdown)
-        location = getLocations(listing)
-        
-        # Check for advanced degree requirements and add graduation cap emoji
-        title_with_degree_emoji = listing["title"]
-        
-        # Check degrees field for advanced degree requirements
-        degrees = listing.get("degrees", [])
-        if degrees:
-            # Check if only advanced degrees are required (no Bachelor's or Associate's)
-            has_bachelors_or_associates = any(
-                degree.lower() in ["bachelor's", "associate's"]
-                for degree in degrees
-            )
-            has_advanced_degrees = any(
-                degree.lower() in ["master's", "phd", "mba"]
-                for degree in degrees
-            )
-            
-            if has_advanced_degrees and not has_bachelors_or_associates:
-                title_with_degree_emoji += " 🎓"
-        
-        # Also check title text for degree mentions
-        title_lower = listing["title"].lower()
-        if any(term in title_lower for term in ["master's", "masters", "master", "mba", "phd", "ph.d", "doctorate", "doctoral"]):
-            if "🎓" not in title_with_degree_emoji:
-                title_with_degree_emoji += " 🎓"
-        
-        position = title_with_degree_emoji + getSponsorship(listing)
-        terms = ", ".join(listing["terms"])
-        link = getLink(listing)
+        company = companies.cell(company_name, listing.get("company_url", "").strip())
 
         # calculate days active
-        days_active = (datetime.now() - datetime.fromtimestamp(listing["date_posted"])).days
-        days_active = max(days_active, 0)  # in case somehow negative
-        days_display = (
-            "0d" if days_active == 0 else
-            f"{(days_active // 30)}mo" if days_active > 30 else
-            f"{days_active}d"
-        )
+        days_active = getDaysActive(listing, now)
             
         # FIXED: comparison to see if same company and same days active
-        if prev_company == company_name and prev_days_active == days_active:
+        collapsed = prev_company == company_name and prev_days_active == days_active
+        if collapsed:
             company = "↳"
         else:
             prev_company = company_name
             prev_days_active = days_active
-        
-        # Create HTML table row
-        table += '<tr>\n'
-        
-        if offSeason:
-            table += f'<td>{company}</td>\n'
-            table += f'<td>{position}</td>\n'
-            table += f'<td>{location}</td>\n'
-            table += f'<td>{terms}</td>\n'
-            table += f'<td>{link}</td>\n'
-            table += f'<td>{days_display}</td>\n'
-        else:
-            table += f'<td>{company}</td>\n'
-            table += f'<td>{position}</td>\n'
-            table += f'<td>{location}</td>\n'
-            table += f'<td>{link}</td>\n'
-            table += f'<td>{days_display}</td>\n'
-        
-        table += '</tr>\n'
 
-    table += '</tbody>\n</table>\n'
-    return table
+        yield renderRow(listing, company, days_active, offSeason, cache), listing, days_active, collapsed
+
+def create_md_table(listings, offSeason=False, now=None, cache=None, companies=None):
+    # Create clean HTML table with minimal styling; rows are collected in a
+    # list and joined once instead of growing one string per cell
+    parts = [getTableHeader(offSeason)]
+    parts.extend(row for row, _, _, _ in iterTableRows(listings, offSeason, now, cache, companies))
+    parts.append(TABLE_FOOTER)
+    return "".join(parts)
 
 
 
 def getListingsFromJSON(filename=".github/scripts/listings.json"):
+    from listings_store import is_store
+    # A listings store is read through its indexes instead
+    if is_store(filename):
+        return getListingsFromStore(filename)
     with open(filename) as f:
         listings = json.load(f)
         print(f"Received {len(listings)} listings from listings.json")
         return listings
 
+def iterListingsFromJSON(filename=".github/scripts/listings.json"):
+    # Streaming counterpart of getListingsFromJSON: yields one listing at a time
+    from listings_store import is_store
+    if is_store(filename):
+        return iterListingsFromStore(filename)
+    return iter_file(filename)
+
+def iterListingsFromStore(path, **filters):
+    """Current listings from a ListingStore; filters as in ListingStore.iter_listings."""
+    from listings_store import ListingStore
+    with ListingStore(path, create=False) as store:
+        yield from store.iter_listings(**filters)
+
+def getListingsFromStore(path, **filters):
+    listings = list(iterListingsFromStore(path, **filters))
+    print(f"Received {len(listings)} listings from {path}")
+    return listings
 
-def classifyJobCategory(job):
-    # Always classify by title for better accuracy, ignore existing category
-    title = job.get("title", "").lower()
-    
-    # Filter out IT technical support roles that aren't really tech internships
-    if any(term in title for term in [
-        "it technical intern", "it technician", "it support", "technical support intern",
-        "help desk", "desktop support", "it help desk", "computer support", "security operations", "field operations",
-        "information technology"
-    ]):
-        return None
-    
+
+# Keyword sets for classifyJobCategory, matched as substrings of the lowercased title.
+# IT technical support roles that aren't really tech internships are excluded outright.
+IT_SUPPORT_TERMS = [
+    "it technical intern", "it technician", "it support", "technical support intern",
+    "help desk", "desktop support", "it help desk", "computer support", "security operations", "field operations",
+    "information technology"
+]
+
+# Categories in priority order; the first one with a matching keyword wins
+CATEGORY_TERMS = [
     # Hardware (first priority) - expanded keywords
-    if any(term in title for term in [
-        "hardware", "embedded", "fpga", "circuit", "chip", "silicon", "asic", "robotics", "firmware", 
+    ("Hardware Engineering", [
+        "hardware", "embedded", "fpga", "circuit", "chip", "silicon", "asic", "robotics", "firmware",
         "manufactur", "electrical", "mechanical", "systems engineer", "test engineer", "validation",
         "verification", "pcb", "analog", "digital", "signal", "power", "rf", "antenna"
-    ]):
-        return "Hardware Engineering"
-    
+    ]),
     # Quant (second priority) - expanded keywords
-    elif any(term in title for term in [
+    ("Quantitative Finance", [
         "quant", "quantitative", "trading", "finance", "investment", "financial", "risk", "portfolio",
         "derivatives", "algorithmic trading", "market", "capital", "equity", "fixed income", "credit"
-    ]):
-        return "Quantitative Finance"
-    
+    ]),
     # Data Science (third priority) - expanded keywords
-    elif any(term in title for term in [
-        "data science", "artificial intelligence", "data scientist", "ai", "machine learning", "ml", 
-        "data analytics", "data analyst", "research eng", "nlp", "computer vision", "research sci", 
+    ("Data Science, AI & Machine Learning", [
+        "data science", "artificial intelligence", "data scientist", "ai", "machine learning", "ml",
+        "data analytics", "data analyst", "research eng", "nlp", "computer vision", "research sci",
         "data eng", "analytics", "statistician", "modeling", "algorithms", "deep learning", "pytorch",
         "tensorflow", "pandas", "numpy", "sql", "etl", "pipeline", "big data", "spark", "hadoop"
-    ]):
-        return "Data Science, AI & Machine Learning"
-    
+    ]),
     # Product (fourth priority) - check before Software to catch "Software Product Management" roles
-    elif any(term in title for term in [
+    ("Product Management", [
         "product manag", "product analyst", "apm", "associate product", "product owner", "product design",
         "product marketing", "product strategy", "business analyst", "program manag", "project manag"
-    ]) or ("product" in title and any(word in title for word in ["analyst", "manager", "associate", "coordinator"])):
-        return "Product Management"
-    
+    ]),
     # Software Engineering (fifth priority) - greatly expanded keywords
-    elif any(term in title for term in [
-        "software", "engineer", "developer", "dev", "programming", "coding", "fullstack", "full-stack", 
-        "full stack", "frontend", "front end", "front-end", "backend", "back end", "back-end", 
-        "mobile", "web", "app", "application", "platform", "infrastructure", "cloud", "devops", 
-        "sre", "site reliability", "systems", "network", "security", "cybersecurity", "qa", 
+    ("Software Engineering", [
+        "software", "engineer", "developer", "dev", "programming", "coding", "fullstack", "full-stack",
+        "full stack", "frontend", "front end", "front-end", "backend", "back end", "back-end",
+        "mobile", "web", "app", "application", "platform", "infrastructure", "cloud", "devops",
+        "sre", "site reliability", "systems", "network", "security", "cybersecurity", "qa",
         "quality assurance", "test", "automation", "ci/cd", "deployment", "kubernetes", "docker",
         "aws", "azure", "gcp", "api", "microservices", "database", "java", "python", "javascript",
         "react", "node", "golang", "rust", "c++", "c#", ".net", "ios", "android", "flutter",
         "technical", "technology", "tech", "coding", "programming", "sde", "swe"
-    ]):
-        return "Software Engineering"
-    
-    # Return None for jobs that don't fit any category (will be filtered out)
-    else:
+    ]),
+]
+
+# "product" plus one of these words also counts as Product Management
+PRODUCT_QUALIFIERS = ["analyst", "manager", "associate", "coordinator"]
+
+def _trieRegex(node):
+    # Alternatives factored into a trie, since re tries a flat alternation one branch at a time
+    branches = [re.escape(ch) + _trieRegex(child) for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ""
+    if len(branches) == 1 and "" not in node:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ")" + ("?" if "" in node else "")
+
+def _compileKeywordMatcher():
+    """
+    Compile every keyword into one regex that reports, at each position of the
+    title, the longest keyword starting there. Any other keyword matching at
+    that position is a prefix of it, so each keyword maps to the bitmask of
+    itself and all keywords that are its prefixes.
+    """
+    flags = [IT_SUPPORT_TERMS] + [terms for _, terms in CATEGORY_TERMS] + [["product"], PRODUCT_QUALIFIERS]
+    own = {}
+    for bit, terms in enumerate(flags):
+        for term in terms:
+            own[term] = own.get(term, 0) | (1 << bit)
+    masks = dict.fromkeys(own, 0)
+    for term in own:
+        for other, mask in own.items():
+            if term.startswith(other):
+                masks[term] |= mask
+
+    trie = {}
+    for term in own:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    return re.compile(f"(?=({_trieRegex(trie)}))"), masks
+
+# Compiled on the first classification rather than at import
+_keywordMatcher = lru_cache(maxsize=None)(_compileKeywordMatcher)
+_IT_SUPPORT_BIT = 1
+_PRODUCT_BIT = 1 << (1 + [name for name, _ in CATEGORY_TERMS].index("Product Management"))
+_PRODUCT_WORD_BIT = 1 << (len(CATEGORY_TERMS) + 1)
+_PRODUCT_QUALIFIER_BIT = 1 << (len(CATEGORY_TERMS) + 2)
+
+@lru_cache(maxsize=65536)
+def classifyTitle(title):
+    """Classify an already-lowercased title; memoized since many listings share a title."""
+    keyword_re, masks = _keywordMatcher()
+    mask = 0
+    for match in keyword_re.finditer(title):
+        mask |= masks[match.group(1)]
+
+    if mask & _IT_SUPPORT_BIT:
         return None
+    if mask & _PRODUCT_WORD_BIT and mask & _PRODUCT_QUALIFIER_BIT:
+        mask |= _PRODUCT_BIT
+    for bit, (name, _) in enumerate(CATEGORY_TERMS, start=1):
+        if mask & (1 << bit):
+            return name
+    # Return None for jobs that don't fit any category (will be filtered out)
+    return None
+
+def classifyJobCategory(job):
+    # Always classify by title for better accuracy, ignore existing category
+    return classifyTitle(job.get("title", "").lower())
 
 def ensureCategories(listings):
     categorized_listings = []
@@ -313,14 +546,16 @@ def ensureCategories(listings):
     print(f"Filtered out {filtered_count} jobs that didn't fit any category")
     return categorized_listings
 
-def create_category_table(listings, category_name, offSeason=False):
-    category_listings = [l for l in listings if l["category"] == category_name]
-    if not category_listings:
-        return ""
+def getCategoryEmoji(category_name):
+    return next((cat["emoji"] for cat in CATEGORIES.values() if cat["name"] == category_name), "")
 
-    emoji = next((cat["emoji"] for cat in CATEGORIES.values() if cat["name"] == category_name), "")
+def getCategoryAnchor(category_name):
+    return category_name.lower().replace(" ", "-").replace(",", "").replace("&", "")
+
+def getCategoryHeader(category_name, back_link="#summer-2026-tech-internships-by-pitt-csc--simplify"):
+    emoji = getCategoryEmoji(category_name)
     header = f"\n\n## {emoji} {category_name} Internship Roles\n\n"
-    header += "[Back to top](#summer-2026-tech-internships-by-pitt-csc--simplify)\n\n"
+    header += f"[Back to top]({back_link})\n\n"
 
     # Optional callout under Data Science section
     if category_name == "Data Science, AI & Machine Learning":
@@ -335,30 +570,314 @@ def create_category_table(listings, category_name, offSeason=False):
             "> 📅 Curious when Big Tech product internships typically open? Simplify put together an [openings tracker](https://simplify.jobs/top-list/Associate-Product-Manager-Intern?utm_source=GHList&utm_medium=ot) based on historical data for those companies.\n"
             "\n"
         )
+    return header
 
-    # Sort and format
-    active = sorted([l for l in category_listings if l["active"]], key=lambda l: l["date_posted"], reverse=True)
-    inactive = sorted([l for l in category_listings if not l["active"]], key=lambda l: l["date_posted"], reverse=True)
-
-    result = header
-    if active:
-        result += create_md_table(active, offSeason) + "\n\n"
+def assembleCategoryTable(category_name, active_table, inactive_table, inactive_count):
+    result = getCategoryHeader(category_name)
+    if active_table:
+        result += active_table + "\n\n"
 
-    if inactive:
+    if inactive_table:
         result += (
             "<details>\n"
-            f"<summary>🗃️ Inactive roles ({len(inactive)})</summary>\n\n"
-            + create_md_table(inactive, offSeason) +
+            f"<summary>🗃️ Inactive roles ({inactive_count})</summary>\n\n"
+            + inactive_table +
             "\n\n</details>\n\n"
         )
 
     return result
 
+def create_category_table(listings, category_name, offSeason=False, now=None, cache=None):
+    category_listings = [l for l in listings if l["category"] == category_name]
+    if not category_listings:
+        return ""
+
+    # Sort and format
+    active = sorted([l for l in category_listings if l["active"]], key=lambda l: l["date_posted"], reverse=True)
+    inactive = sorted([l for l in category_listings if not l["active"]], key=lambda l: l["date_posted"], reverse=True)
+    return renderCategory(category_name, active, inactive, offSeason, now, cache)
+
+def iterCategoryParts(category_name, active, inactive, offSeason=False, now=None, cache=None, companies=None):
+    """
+    The text of renderCategory() in pieces, one table row at a time, so a
+    section can be written out without being held in memory.
+    """
+    yield getCategoryHeader(category_name)
+    if active:
+        yield getTableHeader(offSeason)
+        for row, _, _, _ in iterTableRows(active, offSeason, now, cache, companies):
+            yield row
+        yield TABLE_FOOTER + "\n\n"
+    if inactive:
+        yield f"<details>\n<summary>🗃️ Inactive roles ({len(inactive)})</summary>\n\n" + getTableHeader(offSeason)
+        for row, _, _, _ in iterTableRows(inactive, offSeason, now, cache, companies):
+            yield row
+        yield TABLE_FOOTER + "\n\n</details>\n\n"
+
+def renderCategory(category_name, active, inactive, offSeason=False, now=None, cache=None, companies=None):
+    """Render one category section from its already sorted active and inactive listings."""
+    def render():
+        return "".join(iterCategoryParts(category_name, active, inactive, offSeason, now, cache, companies))
+
+    if cache is None:
+        return render()
+    return cache.section(category_name, cache.sectionKey(category_name, offSeason, active, inactive, now), render)
+
+class CategoryIndex:
+    """
+    Listings grouped by category into (active, inactive) lists, each sorted
+    newest first. build() drops repeat postings, classifies, marks stale
+    listings and groups them in a single pass, so counts and tables can be
+    read off without rescanning. With dedupe, the first listing for each
+    posting (canonical_url.url_hash) is kept, which after sortListings is
+    the one listingRank ranks highest, as in ListingStore.apply_scrape.
+    """
+
+    def __init__(self):
+        self.groups = {}  # category name -> (active, inactive)
+        self.filtered_count = 0
+        self.duplicate_count = 0
+
+    @classmethod
+    @metrics.timed("util.CategoryIndex.build")
+    def build(cls, listings, now=None, classify=True, mark_stale=True, dedupe=True):
+        index = cls()
+        groups = index.groups
+        seen = UrlHashSet() if dedupe else None
+        cache_hits = classifyTitle.cache_info().hits if metrics.enabled else 0
+        if mark_stale:
+            computeAges(listings, now)
+        for listing in listings:
+            if dedupe and not seen.add(listing["url"]):
+                index.duplicate_count += 1
+                continue
+            if classify:
+                category = classifyJobCategory(listing)
+                if category is None:  # Only keep jobs that fit our categories
+                    index.filtered_count += 1
+                    continue
+                listing["category"] = category
+            if mark_stale and isStale(listing):
+                listing["active"] = False
+            pair = groups.get(listing["category"])
+            if pair is None:
+                pair = groups[listing["category"]] = ([], [])
+            pair[0 if listing.get("active", False) else 1].append(listing)
+        for active, inactive in groups.values():
+            active.sort(key=lambda l: l["date_posted"], reverse=True)
+            inactive.sort(key=lambda l: l["date_posted"], reverse=True)
+        if metrics.enabled:
+            metrics.count("CategoryIndex.rows_in", len(listings))
+            metrics.count("CategoryIndex.rows_out", sum(index.counts(include_inactive=True).values()))
+            metrics.count("CategoryIndex.rows_filtered", index.filtered_count)
+            metrics.count("CategoryIndex.duplicates", index.duplicate_count)
+            metrics.count("classifyTitle.cache_hits", classifyTitle.cache_info().hits - cache_hits)
+        return index
+
+    def active(self, category_name):
+        return self.groups.get(category_name, ([], []))[0]
+
+    def inactive(self, category_name):
+        return self.groups.get(category_name, ([], []))[1]
+
+    def counts(self, include_inactive=False):
+        """Number of listings per category name, active only by default."""
+        return {
+            name: len(active) + (len(inactive) if include_inactive else 0)
+            for name, (active, inactive) in self.groups.items()
+        }
+
+    def total_active(self):
+        return sum(len(active) for active, _ in self.groups.values())
+
+    def ordered(self):
+        """(name, active, inactive) for every non-empty category, in CATEGORY_ORDER."""
+        for category_key in CATEGORY_ORDER:
+            if category_key in CATEGORIES:
+                name = CATEGORIES[category_key]["name"]
+                active, inactive = self.groups.get(name, ([], []))
+                if active or inactive:
+                    yield name, active, inactive
+
+def renderCategoryTables(index, offSeason=False, now=None, cache=None, workers=1, companies=None):
+    """
+    Yield the text of every non-empty category section of a CategoryIndex in
+    CATEGORY_ORDER. Without a cache the serial path yields each section a
+    row at a time (see iterCategoryParts), so embedTable never holds more
+    than one row of table text; cached sections are yielded whole. With
+    workers > 1 the active and inactive tables of each category are
+    rendered on a process pool; the assembled output is identical to the
+    serial path. companies (a CompanyIndex) is only used by the serial
+    path; pool workers build their own company cells. Workers don't reuse
+    cached rows, but send back the rows they render so the cache keeps them
+    for the next run.
+    """
+    now = now or localNow()
+    sections = list(index.ordered())
+
+    if workers <= 1:
+        for name, active, inactive in sections:
+            if cache is None:
+                yield from iterCategoryParts(name, active, inactive, offSeason, now, None, companies)
+            else:
+                yield renderCategory(name, active, inactive, offSeason, now, cache, companies)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        keys, futures = {}, {}
+        for name, active, inactive in sections:
+            if cache is not None:
+                keys[name] = cache.sectionKey(name, offSeason, active, inactive, now)
+                if cache.isFresh(name, keys[name]):
+                    continue
+            futures[name] = [
+                pool.submit(_renderTableRows, rows, offSeason, now, cache is not None) if rows else None
+                for rows in (active, inactive)
+            ]
+
+        for name, active, inactive in sections:
+            def render():
+                parts = []
+                for future in futures.pop(name):
+                    table, rows = future.result() if future else ("", {})
+                    if cache is not None:
+                        for row_key, html in rows.items():
+                            cache.row(row_key, lambda html=html: html)
+                    parts.append(table)
+                return assembleCategoryTable(name, *parts, len(inactive))
+            yield cache.section(name, keys[name], render) if cache is not None else render()
+
+def _renderTableRows(listings, offSeason, now, record_rows):
+    """create_md_table on a pool worker, plus {row key: row} when record_rows."""
+    recorder = RenderCache(None) if record_rows else None
+    table = create_md_table(listings, offSeason, now, recorder)
+    return table, recorder._used_rows if recorder else {}
+
+class RenderCache:
+    """
+    Category sections and table rows rendered by the previous embedTable run,
+    persisted as JSON. A section is keyed by a hash of its listings and each
+    row's age, so only categories whose inputs changed are re-rendered, and
+    those reuse every row whose listing and age are unchanged.
+    """
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+        self.sections = {}  # category -> {"key", "html", "rows"}
+        self.rows = {}      # row key -> rendered <tr>
+        self.output = {}    # stat + browse text of the last README written
+        if path and os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self.sections = data["sections"]
+                self.rows = data["rows"]
+                self.output = data["output"]
+        self.hits = self.misses = 0
+        self._fingerprints = {}
+        self._used_sections = {}
+        self._used_rows = {}
+        self._section_rows = None
+
+    def fingerprint(self, listing):
+        fp = self._fingerprints.get(id(listing))
+        if fp is None:
+            blob = json.dumps(listing, sort_keys=True).encode()
+            fp = self._fingerprints[id(listing)] = hashlib.sha1(blob).hexdigest()[:16]
+        return fp
+
+    def sectionKey(self, category_name, offSeason, active, inactive, now):
+        h = hashlib.sha1(f"{category_name}:{offSeason:d}".encode())
+        for rows in (active, inactive):
+            h.update(b"|")
+            for listing in rows:
+                h.update(f"{self.fingerprint(listing)}:{getDaysActive(listing, now)},".encode())
+        return h.hexdigest()
+
+    def isFresh(self, category_name, key):
+        cached = self.sections.get(category_name)
+        return bool(cached) and cached["key"] == key
+
+    def section(self, category_name, key, render):
+        if self.isFresh(category_name, key):
+            cached = self.sections[category_name]
+            self.hits += 1
+            for row_key in cached["rows"]:
+                if row_key in self.rows:
+                    self._used_rows[row_key] = self.rows[row_key]
+            self._used_sections[category_name] = cached
+            return cached["html"]
+
+        self.misses += 1
+        self._section_rows = []
+        html = render()
+        self._used_sections[category_name] = {"key": key, "html": html, "rows": self._section_rows}
+        self._section_rows = None
+        return html
+
+    def row(self, row_key, render):
+        html = self.rows.get(row_key)
+        if html is None:
+            html = render()
+        self._used_rows[row_key] = html
+        if self._section_rows is not None:
+            self._section_rows.append(row_key)
+        return html
+
+    def _stat(self, filepath, browse, offSeason):
+        st = os.stat(filepath)
+        return {"path": os.path.abspath(filepath), "size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                "browse": browse, "offSeason": offSeason}
+
+    def unchanged(self, filepath, browse, offSeason, keys):
+        """True if every section in keys (category -> sectionKey) is fresh and the README is still exactly what we last wrote."""
+        if set(keys) != set(self.sections) or not all(self.isFresh(name, key) for name, key in keys.items()):
+            return False
+        return os.path.exists(filepath) and self.output == self._stat(filepath, browse, offSeason)
+
+    def save(self, filepath, browse, offSeason):
+        self.sections, self.rows = self._used_sections, self._used_rows
+        self.output = self._stat(filepath, browse, offSeason)
+        with atomic_open(self.path) as f:
+            json.dump({"version": self.VERSION, "sections": self.sections,
+                       "rows": self.rows, "output": self.output}, f)
+
 # GitHub README file size limit (500 KiB = 512,000 bytes)
 GITHUB_FILE_SIZE_LIMIT = 512000
 # Smaller buffer to show warning closer to actual cutoff (5 KiB buffer)
 SIZE_BUFFER = 5120
 
+# Closes the current table, links to the full list, and reopens a table
+CUTOFF_WARNING = """
+</tbody>
+</table>
+
+---
+
+<div align="center" id="github-cutoff-warning">
+  <h2>🔗 See Full List</h2>
+  <p><strong>⚠️ GitHub preview cuts off around here due to file size limits.</strong></p>
+  <p>📋 <strong><a href="https://github.com/SimplifyJobs/Summer2026-Internships/blob/dev/README.md#-see-full-list">Click here to view the complete list with all internship opportunities!</a></strong> 📋</p>
+  <p><em>To find even more internships in tech, check out <a href="https://simplify.jobs/jobs?category=Software%20Engineering%3BHardware%20Engineering%3BQuantitative%20Finance%3BProduct%20Management%3BData%20%26%20Analytics%3BIT%20%26%20Security&jobId=2ac81173-86b5-4dbd-a7a9-260847c259cc&jobType=Internship?utm_source=GHList">Simplify's website</a>.</em></p>
+</div>
+
+---
+
+<table>
+<thead>
+<tr>
+<th>Company</th>
+<th>Role</th>
+<th>Location</th>
+<th>Application</th>
+<th>Age</th>
+</tr>
+</thead>
+<tbody>
+"""
+
 def check_and_insert_warning(content, repo_name="Summer2026-Internships"):
     """Insert warning notice before GitHub cutoff point while preserving full content"""
     content_size = len(content.encode('utf-8'))
@@ -390,33 +909,7 @@ def check_and_insert_warning(content, repo_name="Summer2026-Internships"):
         insertion_point = len(insertion_content)
     
     # Create the warning notice with anchor link
-    warning_notice = f"""
-</tbody>
-</table>
-
----
-
-<div align="center" id="github-cutoff-warning">
-  <h2>🔗 See Full List</h2>
-  <p><strong>⚠️ GitHub preview cuts off around here due to file size limits.</strong></p>
-  <p>📋 <strong><a href="https://github.com/SimplifyJobs/Summer2026-Internships/blob/dev/README.md#-see-full-list">Click here to view the complete list with all internship opportunities!</a></strong> 📋</p>
-  <p><em>To find even more internships in tech, check out <a href="https://simplify.jobs/jobs?category=Software%20Engineering%3BHardware%20Engineering%3BQuantitative%20Finance%3BProduct%20Management%3BData%20%26%20Analytics%3BIT%20%26%20Security&jobId=2ac81173-86b5-4dbd-a7a9-260847c259cc&jobType=Internship?utm_source=GHList">Simplify's website</a>.</em></p>
-</div>
-
----
-
-<table>
-<thead>
-<tr>
-<th>Company</th>
-<th>Role</th>
-<th>Location</th>
-<th>Application</th>
-<th>Age</th>
-</tr>
-</thead>
-<tbody>
-"""
+    warning_notice = CUTOFF_WARNING
     
     # Split content at insertion point and insert warning
     before_insertion = content[:insertion_point]
@@ -424,48 +917,289 @@ def check_and_insert_warning(content, repo_name="Summer2026-Internships"):
     
     return before_insertion + warning_notice + after_insertion
 
-def embedTable(listings, filepath, offSeason=False):
-    # Ensure all listings have a category
-    listings = ensureCategories(listings)
-    listings = mark_stale_listings(listings)
-    # Filter only active listings
-    active_listings = filter_active(listings)
-    total_active = len(active_listings)
-
-    # Count listings by category
-    category_counts = {}
-    for category_info in CATEGORIES.values():
-        count = len([l for l in active_listings if l["category"] == category_info["name"]])
-        category_counts[category_info["name"]] = count
+class ReadmeWriter:
+    """
+    Streams a README to a temp file next to filepath and renames it over
+    filepath on a clean close, so a crash never leaves a half-written file.
+    Each piece is encoded once and the running byte count is used to put
+    CUTOFF_WARNING at the same </tr> boundary check_and_insert_warning
+    would. Only the bytes after the last </tr> (at most a few KiB once the
+    cutoff is near) are held back, in case the warning goes inside them.
+    With cutoff_warning=False (shard pages, which are sized to fit) nothing
+    is inserted or held back.
+    """
+
+    def __init__(self, filepath, cutoff_warning=True):
+        self.filepath = filepath
+        self.cutoff_warning = cutoff_warning
+        fd, self.tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filepath)), prefix=".readme-", suffix=".tmp")
+        self.f = os.fdopen(fd, "wb")
+        self.written = 0              # bytes already in the temp file
+        self.pending = bytearray()    # bytes held back
+        self.seen_tr = False          # a </tr> ends exactly at self.written
+        self.insert_at = None         # chosen offset for the warning, once past the target
+        self.inserted = False
+        self.replaced = False         # close() has renamed the temp file over filepath
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # A failing cleanup must not replace the exception being handled
+            with contextlib.suppress(Exception):
+                self.abort()
+
+    @property
+    def size(self):
+        return self.written + len(self.pending)
+
+    def write(self, text):
+        self.pending += text.encode("utf-8") if isinstance(text, str) else text
+        if self.inserted or not self.cutoff_warning:
+            self._flush(len(self.pending))
+            return
+
+        target = GITHUB_FILE_SIZE_LIMIT - 2 * SIZE_BUFFER
+        if self.insert_at is None:
+            if self.size < target:
+                # Everything up to the latest </tr> can no longer hold the warning
+                last = self.pending.rfind(b"</tr>")
+                if last != -1:
+                    self._flush(last + 5)
+                    self.seen_tr = True
+                return
+            self.insert_at = self._insertionPoint(target)
+            self._flush(self.insert_at - self.written)
+
+        if self.size > GITHUB_FILE_SIZE_LIMIT - SIZE_BUFFER:
+            warning = CUTOFF_WARNING.encode("utf-8")
+            self.f.write(warning)
+            self.written += len(warning)
+            self.inserted = True
+            metrics.count("ReadmeWriter.cutoff_warnings")
+            self._flush(len(self.pending))
+
+    def _insertionPoint(self, target):
+        # Byte offset matching check_and_insert_warning's choice for a file longer than target
+        head = self.pending[:target - self.written]
+        last = head.rfind(b"</tr>")
+        if last != -1:
+            tr_end = self.written + last + 5
+        elif self.seen_tr:
+            tr_end = self.written
+        else:
+            # No row before the target: cut at the last character boundary
+            pos = target - self.written
+            while 0 < pos < len(self.pending) and self.pending[pos] & 0xC0 == 0x80:
+                pos -= 1
+            return self.written + pos
+        newline = head.find(b"\n", tr_end - self.written)
+        return self.written + newline if newline != -1 else tr_end
+
+    def _flush(self, n):
+        if n > 0:
+            self.f.write(self.pending[:n])
+            del self.pending[:n]
+            self.written += n
+
+    def close(self):
+        self._flush(len(self.pending))
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        self.f.close()
+        # mkstemp creates the file 0600; keep the README's permissions
+        if os.path.exists(self.filepath):
+            os.chmod(self.tmp_path, os.stat(self.filepath).st_mode & 0o7777)
+        os.replace(self.tmp_path, self.filepath)
+        self.replaced = True
+
+    def abort(self):
+        """Discard the temp file, leaving filepath as it was; a no-op after close()."""
+        if self.replaced:
+            return
+        self.f.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+def shardPageName(filepath, category_name, part=1):
+    """README-software-engineering.md, README-software-engineering-2.md, ... next to filepath."""
+    base, ext = os.path.splitext(os.path.basename(filepath))
+    slug = re.sub(r"[^a-z0-9]+", "-", category_name.lower()).strip("-")
+    return f"{base}-{slug}{'' if part == 1 else f'-{part}'}{ext}"
+
+def writeCategoryPages(filepath, category_name, active, inactive, offSeason=False, now=None, cache=None,
+                       companies=None):
+    """
+    Write one category's tables to its own pages next to filepath, starting a
+    new page whenever the next row would push the current one past
+    GITHUB_FILE_SIZE_LIMIT - SIZE_BUFFER. Each page closes its table (and the
+    inactive <details>) and links to the next; the first row on a new page
+    always shows its company. Pages left over from a longer previous render
+    are removed. Returns the page file names.
+    """
+    now = now or localNow()
+    companies = companies if companies is not None else CompanyIndex()
+    directory = os.path.dirname(os.path.abspath(filepath))
+    readme = os.path.basename(filepath)
+    budget = GITHUB_FILE_SIZE_LIMIT - SIZE_BUFFER
+    table_header = getTableHeader(offSeason).encode("utf-8")
+    pages = []
+    out = None
+    rows_on_page = 0
+
+    def sectionStart(is_inactive, continued):
+        start = b""
+        if is_inactive:
+            label = "continued" if continued else len(inactive)
+            start = f"<details>\n<summary>🗃️ Inactive roles ({label})</summary>\n\n".encode("utf-8")
+        return start + table_header
+
+    def sectionEnd(is_inactive):
+        return TABLE_FOOTER.encode("utf-8") + (b"\n\n</details>\n\n" if is_inactive else b"\n\n")
+
+    def openPage():
+        nonlocal out, rows_on_page
+        part = len(pages) + 1
+        pages.append(shardPageName(filepath, category_name, part))
+        out = ReadmeWriter(os.path.join(directory, pages[-1]), cutoff_warning=False)
+        if part == 1:
+            out.write(getCategoryHeader(category_name, back_link=readme).lstrip("\n"))
+        else:
+            out.write(f"## {getCategoryEmoji(category_name)} {category_name} Internship Roles (part {part})\n\n"
+                      f"[Back to top]({readme}) · [Previous page]({pages[-2]})\n\n")
+        rows_on_page = 0
+
+    def nextLink():
+        return f"➡️ [Continued on the next page]({shardPageName(filepath, category_name, len(pages) + 1)})\n".encode("utf-8")
+
+    section = None  # is_inactive of the table open on the current page, None before its first row
+    try:
+        openPage()
+        for is_inactive, rows in ((False, active), (True, inactive)):
+            for row, listing, days_active, collapsed in iterTableRows(rows, offSeason, now, cache, companies):
+                row = row.encode("utf-8")
+                # Closing the active table and opening the inactive one count against this page too
+                opening = b""
+                if section is not is_inactive:
+                    opening = (sectionEnd(section) if section is not None else b"") + sectionStart(is_inactive, continued=False)
+                tail = sectionEnd(is_inactive) + nextLink()
+                # A row that alone exceeds the budget still gets a page of its own
+                if rows_on_page and out.size + len(opening) + len(row) + len(tail) > budget:
+                    out.write(sectionEnd(section) + nextLink())
+                    out.close()
+                    openPage()
+                    opening = sectionStart(is_inactive, continued=section is is_inactive)
+                    if collapsed:
+                        company = companies.cell(listing["company_name"], listing.get("company_url", "").strip())
+                        row = renderRow(listing, company, days_active, offSeason, cache).encode("utf-8")
+                out.write(opening + row)
+                section = is_inactive
+                rows_on_page += 1
+        if section is not None:
+            out.write(sectionEnd(section))
+        out.close()
+    except BaseException:
+        # Cleaning up the page must not replace the original error
+        with contextlib.suppress(Exception):
+            out.abort()
+        raise
+
+    removeStalePages(filepath, category_name, len(pages) + 1)
+    return pages
+
+def removeStalePages(filepath, category_name, first_part=1):
+    directory = os.path.dirname(os.path.abspath(filepath))
+    part = first_part
+    while os.path.exists(os.path.join(directory, shardPageName(filepath, category_name, part))):
+        os.remove(os.path.join(directory, shardPageName(filepath, category_name, part)))
+        part += 1
+
+def getShardIndex(category_name, pages, active_count, inactive_count):
+    """Stand-in for a category's tables in the main README: links to its pages."""
+    links = " · ".join(f"[Page {i}]({page})" for i, page in enumerate(pages, 1))
+    return (getCategoryHeader(category_name)
+            + f"{active_count} active and {inactive_count} inactive roles: {links}\n\n")
+
+@metrics.timed("util.embedTable")
+def embedTable(listings, filepath, offSeason=False, cache_path=None, workers=1, shard=False):
+    """
+    Regenerate the Browse and TABLE_START/TABLE_END sections of filepath.
+    With shard=True each category's tables go to their own size-limited
+    pages (see writeCategoryPages) and the README links to them; the render
+    cache then only supplies rows, and workers is ignored.
+    """
+    # Capture "now" once so every table in this render agrees on ages
+    now = localNow()
+    # Categorize, mark stale listings and group by category in one pass
+    index = CategoryIndex.build(listings, now)
+    print(f"Filtered out {index.filtered_count} jobs that didn't fit any category")
+    if index.duplicate_count:
+        print(f"Skipped {index.duplicate_count} repeat postings of the same job")
+    companies = CompanyIndex.build(listings)
+    total_active = index.total_active()
+
+    # Count active listings by category
+    category_counts = index.counts()
 
     # Build the category summary for the Browse section
     # Order: Software, Product, Data, Quant, Hardware
-    category_order = ["Software", "Product", "AI/ML/Data", "Quant", "Hardware"]
     category_links = []
     # Use the appropriate README file based on whether this is off-season or not
     readme_filename = "README-Off-Season.md" if offSeason else "README.md"
     github_readme_base = f"https://github.com/SimplifyJobs/Summer2026-Internships/blob/dev/{readme_filename}"
-    for category_key in category_order:
+    for category_key in CATEGORY_ORDER:
         if category_key in CATEGORIES:
             category_info = CATEGORIES[category_key]
             name = category_info["name"]
             emoji = category_info["emoji"]
-            count = category_counts[name]
-            anchor = name.lower().replace(" ", "-").replace(",", "").replace("&", "")
+            count = category_counts.get(name, 0)
+            anchor = getCategoryAnchor(name)
             category_links.append(f"{emoji} **[{name}]({github_readme_base}#-{anchor}-internship-roles)** ({count})")
     category_counts_str = "\n\n".join(category_links)
+    browse = f"### Browse {total_active} Internship Roles by Category\n\n{category_counts_str}\n\n---\n"
+
+    # Tables for each category in order, rendered while the README is
+    # written; with a cache, only the categories whose listings or ages
+    # changed are rendered again
+    cache = RenderCache(cache_path) if cache_path else None
+    if shard:
+        tables = []
+        for name, active, inactive in index.ordered():
+            pages = writeCategoryPages(filepath, name, active, inactive, offSeason, now, cache, companies)
+            tables.append(getShardIndex(name, pages, len(active), len(inactive)))
+        written = {name for name, _, _ in index.ordered()}
+        for category_info in CATEGORIES.values():
+            if category_info["name"] not in written:
+                removeStalePages(filepath, category_info["name"])
+    else:
+        tables = renderCategoryTables(index, offSeason, now, cache, workers, companies)
+
+    if cache is not None and not shard:
+        # Section keys decide up front whether anything needs rendering
+        keys = {name: cache.sectionKey(name, offSeason, active, inactive, now)
+                for name, active, inactive in index.ordered()}
+        fresh = sum(cache.isFresh(name, key) for name, key in keys.items())
+        print(f"Render cache: {fresh} categories reused, {len(keys) - fresh} re-rendered")
+        metrics.count("embedTable.cache_hits", fresh)
+        metrics.count("embedTable.cache_misses", len(keys) - fresh)
+        if cache.unchanged(filepath, browse, offSeason, keys):
+            print(f"{filepath} is up to date")
+            return
 
-    newText = ""
     in_browse_section = False
     browse_section_replaced = False
     in_table_section = False
-    table_section_replaced = False
 
-    with open(filepath, "r") as f:
-        for line in f.readlines():
+    # Stream the new README to a temp file; the size warning is inserted on
+    # the fly and the file only replaces the old one once it is complete
+    with ReadmeWriter(filepath) as out, open(filepath, "r") as f:
+        for line in f:
             if not browse_section_replaced and line.startswith("### Browse"):
                 in_browse_section = True
-                newText += f"### Browse {total_active} Internship Roles by Category\n\n{category_counts_str}\n\n---\n"
+                out.write(browse)
                 browse_section_replaced = True
                 continue
 
@@ -476,52 +1210,51 @@ def embedTable(listings, filepath, offSeason=False):
 
             if not in_table_section and "TABLE_START" in line:
                 in_table_section = True
-                newText += line
-                newText += "\n---\n\n"
+                out.write(line)
+                out.write("\n---\n\n")
                 # Add minimal CSS styles (optional - can be removed entirely)
-                # newText += get_minimal_css()
+                # out.write(get_minimal_css())
                 # Add tables for each category in order
-                category_order = ["Software", "Product", "AI/ML/Data", "Quant", "Hardware"]
-                for category_key in category_order:
-                    if category_key in CATEGORIES:
-                        category_info = CATEGORIES[category_key]
-                        table = create_category_table(listings, category_info["name"], offSeason)
-                        if table:
-                            newText += table
+                for table in tables:
+                    out.write(table)
                 continue
 
             if in_table_section:
                 if "TABLE_END" in line:
                     in_table_section = False
-                    newText += line
+                    out.write(line)
                 continue
 
             if not in_browse_section and not in_table_section:
-                newText += line
+                out.write(line)
 
-    # Check content size and insert warning if necessary
-    final_content = check_and_insert_warning(newText)
-    
-    with open(filepath, "w") as f:
-        f.write(final_content)
+    metrics.count("embedTable.bytes_written", out.size)
+    if cache is not None:
+        cache.save(filepath, browse, offSeason)
 
 
 def filterSummer(listings, year, earliest_date):
+    return list(iterFilterSummer(listings, year, earliest_date))
+
+
+def iterFilterSummer(listings, year, earliest_date):
     # Convert blocked URLs to lowercase for case-insensitive comparison
     blocked_urls_lower = {url.lower() for url in BLOCKED_COMPANIES}
-    
-    final_listings = []
+    summer_term = f"Summer {year}"
+
     for listing in listings:
-        if listing["is_visible"] and any(f"Summer {year}" in item for item in listing["terms"]) and listing['date_posted'] > earliest_date:
+        if listing["is_visible"] and any(summer_term in item for item in listing["terms"]) and listing['date_posted'] > earliest_date:
             # Check if listing is from a blocked company
             company_url = listing.get("company_url", "").lower()
             if not any(blocked_url in company_url for blocked_url in blocked_urls_lower):
-                final_listings.append(listing)
-    
-    return final_listings
+                yield listing
 
 
 def filterOffSeason(listings):
+    return list(iterFilterOffSeason(listings))
+
+
+def iterFilterOffSeason(listings):
     def isOffSeason(listing):
         if not listing.get("is_visible"):
             return False
@@ -539,43 +1272,148 @@ def filterOffSeason(listings):
         # We can re-visit this in the future, but excluding listings with "Summer" term for better UX for now.
         return has_off_season_term and not has_summer_term
 
-    return [listing for listing in listings if isOffSeason(listing)]
-
-
-def sortListings(listings):
-    oldestListingFromCompany = {}
-    linkForCompany = {}
+    return (listing for listing in listings if isOffSeason(listing))
+
+
+def listingRank(listing, company_lower=None):
+    """
+    The key sortListings sorts by, descending: active first, then newest
+    date_posted, company name (case-insensitive) and newest date_updated.
+    Of several listings for one posting, CategoryIndex and
+    ListingStore.apply_scrape both keep the one ranked highest, the earliest
+    on a tie.
+    """
+    if company_lower is None:
+        company_lower = (listing.get("company_name") or "").lower()
+    return (bool(listing.get("active", True)), listing.get("date_posted") or 0,
+            company_lower, listing.get("date_updated") or 0)
+
+def sortListings(listings, companies=None):
+    """
+    Sort listings in place: active first, then newest date_posted, company
+    name descending (case-insensitive) and newest date_updated. Every
+    listing of a company is given the company's last non-empty company_url.
+    companies is a CompanyIndex of these listings, built here if not given.
+    """
+    companies = companies if companies is not None else CompanyIndex.build(listings)
+    stats = companies.companies
+    keys = {name: company.lower for name, company in stats.items()}
+
+    listings.sort(key=lambda x: listingRank(x, keys[x["company_name"]]), reverse=True)
 
     for listing in listings:
-        date_posted = listing["date_posted"]
-        if listing["company_name"].lower() not in oldestListingFromCompany or oldestListingFromCompany[listing["company_name"].lower()] > date_posted:
-            oldestListingFromCompany[listing["company_name"].lower()] = date_posted
-        if listing["company_name"] not in linkForCompany or len(listing["company_url"]) > 0:
-            linkForCompany[listing["company_name"]] = listing["company_url"]
-
-    listings.sort(
-        key=lambda x: (
-            x["active"],  # Active listings first
-            x['date_posted'],
-            x['company_name'].lower(),
-            x['date_updated']
-        ),
-        reverse=True
-    )
-
-    for listing in listings:
-        listing["company_url"] = linkForCompany[listing["company_name"]]
+        listing["company_url"] = stats[listing["company_name"]].url
 
     return listings
 
 
+# Fields every upstream listing must have, with the types the renderers rely on
+PROP_TYPES = {
+    "source": str, "company_name": str, "id": str, "title": str, "active": bool,
+    "date_updated": int, "is_visible": bool, "date_posted": int, "url": str,
+    "locations": list, "company_url": str, "terms": list, "sponsorship": str,
+}
+REQUIRED_PROPS = frozenset(PROP_TYPES)
+# List fields whose items are joined into the tables as text
+STR_LIST_PROPS = ("locations", "terms")
+
+class SchemaValidator:
+    """
+    Checks listings against PROP_TYPES and collects every violation instead
+    of stopping at the first. check() validates one listing; filter()
+    streams rows through, yielding the valid ones and setting the invalid
+    ones aside in quarantined, so one bad record doesn't hold up the rest.
+    """
+    MAX_REPORTED = 50
+
+    def __init__(self):
+        self.checked = 0
+        self.violations = []   # (position, listing id, problem)
+        self.quarantined = []
+
+    @property
+    def invalid(self):
+        return len(self.quarantined)
+
+    _PROPS = tuple(PROP_TYPES)
+    _TYPES = tuple(PROP_TYPES.values())
+
+    @classmethod
+    def passes(cls, listing):
+        """Fast path for valid listings: one tuple of field types compared at once."""
+        try:
+            if tuple(map(type, map(listing.__getitem__, cls._PROPS))) != cls._TYPES:
+                return False
+        except (KeyError, TypeError, AttributeError):
+            return False
+        for prop in STR_LIST_PROPS:
+            for item in listing[prop]:
+                if type(item) is not str:
+                    return False
+        return True
+
+    @staticmethod
+    def problems(listing):
+        """Every way listing breaks the schema, as readable messages."""
+        if not isinstance(listing, dict):
+            return [f"is a {type(listing).__name__}, not an object"]
+        found = [f"does not contain prop '{prop}'" for prop in sorted(REQUIRED_PROPS - listing.keys())]
+        for prop, expected in PROP_TYPES.items():
+            # type() rather than isinstance so True doesn't pass as an int date
+            value = listing.get(prop)
+            if type(value) is not expected and prop in listing:
+                found.append(f"prop '{prop}' is {type(value).__name__}, expected {expected.__name__}")
+        for prop in STR_LIST_PROPS:
+            items = listing.get(prop)
+            if type(items) is list and not all(type(item) is str for item in items):
+                found.append(f"prop '{prop}' contains non-string items")
+        return found
+
+    def check(self, listing):
+        """Validate one listing, recording its problems; returns whether it passed."""
+        position = self.checked
+        self.checked += 1
+        if self.passes(listing):
+            return True
+        problems = self.problems(listing)
+        listing_id = listing.get("id") if isinstance(listing, dict) else None
+        self.violations.extend((position, listing_id, problem) for problem in problems)
+        self.quarantined.append(listing)
+        return False
+
+    def filter(self, rows):
+        for listing in rows:
+            if self.check(listing):
+                yield listing
+
+    def summary(self):
+        """One line, safe to pass to setOutput."""
+        if not self.violations:
+            return f"Schema check passed for {self.checked} listings"
+        _, listing_id, problem = self.violations[0]
+        return (f"Schema check FAILED - {len(self.violations)} violations in {self.invalid} of "
+                f"{self.checked} listings; first: object with id {listing_id} {problem}")
+
+    def report(self, limit=MAX_REPORTED):
+        lines = [self.summary()]
+        for position, listing_id, problem in self.violations[:limit]:
+            lines.append(f"  #{position} (id {listing_id}): {problem}")
+        if len(self.violations) > limit:
+            lines.append(f"  ... and {len(self.violations) - limit} more")
+        return "\n".join(lines)
+
+    def saveQuarantine(self, path):
+        """Write the quarantined listings as a JSON array, atomically."""
+        with atomic_open(path) as f:
+            dump_array(self.quarantined, f)
+
+@metrics.timed("util.checkSchema")
 def checkSchema(listings):
-    props = ["source", "company_name",
-             "id", "title", "active", "date_updated", "is_visible",
-             "date_posted", "url", "locations", "company_url", "terms",
-             "sponsorship"]
+    """Validate every listing, print all violations and fail if there were any."""
+    validator = SchemaValidator()
     for listing in listings:
-        for prop in props:
-            if prop not in listing:
-                fail("ERROR: Schema check FAILED - object with id " +
-                      listing["id"] + " does not contain prop '" + prop + "'")
\ No newline at end of file
+        validator.check(listing)
+    metrics.count("checkSchema.invalid", validator.invalid)
+    if validator.violations:
+        print(validator.report())
+        fail("ERROR: " + validator.summary())
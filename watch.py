@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Long-running watcher: polls the upstream listings and keeps everything
+downstream current from one warm process.
+
+Every --interval seconds (randomized by --jitter) it makes a conditional
+fetch (scraper.fetch_listings_delta), so an unchanged upstream costs one
+304. When the listings change it:
+
+  - applies the scrape to the listings store and refreshes the search index,
+  - upserts the added and changed listings matching --push (a search_index
+    query) into Notion, reusing one client and the in-memory page index,
+  - regenerates --readme (skipped with --readme "").
+
+The parsed listings, the Notion page index and the render cache stay in
+memory between polls. What a restart needs is checkpointed in
+STATE_FILE: jobs whose push hasn't succeeded yet and whether the README
+is behind, next to the fetch validators and fingerprints the scraper
+already keeps. A restart therefore resumes with a conditional fetch
+instead of a full rescan.
+
+GET /health on --port answers 200 while polls succeed (503 after a failed
+one), and GET /metrics returns the watcher's counters with metrics.summary().
+SIGINT/SIGTERM finish the current cycle, checkpoint and exit.
+
+    python watch.py [--interval 300] [--push "quant AND nyc"] [--readme README.md] [--port 8787]
+"""
+import os
+import sys
+import json
+import time
+import random
+import signal
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import util
+import metrics
+import scraper
+from atomicfile import write_atomic
+from listings_store import ListingStore, DEFAULT_PATH as DEFAULT_DB
+from search_index import SearchIndex, indexPath
+
+STATE_FILE = "watch.state.json"  # in scraper.CACHE_DIR
+STATE_VERSION = 1
+
+class Watcher:
+    def __init__(self, args):
+        self.args = args
+        self.stopping = threading.Event()
+        self.state_path = os.path.join(args.cache_dir, STATE_FILE)
+        self.raw_path = os.path.join(args.cache_dir, scraper.RAW_FILE)
+        self.state = {
+            "version": STATE_VERSION, "polls": 0, "changes": 0, "pushed": 0, "failed_polls": 0,
+            "started_at": int(time.time()), "last_poll": None, "last_change": None, "last_error": None,
+            "pending": [],          # [company, url, role] still to upsert into Notion
+            "readme_stale": False,  # a change arrived after the last successful render
+        }
+        self.lock = threading.Lock()
+        self.listings = None
+        self.store = ListingStore(args.db)
+        self.notion = None  # write_to_notion, imported on the first push
+
+    # Checkpoint
+
+    def load_state(self):
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                saved = json.load(f)
+            if saved.get("version") == STATE_VERSION:
+                saved.pop("started_at", None)
+                self.state.update(saved)
+        if self.state["pending"] or self.state["readme_stale"]:
+            print(f"Resuming: {len(self.state['pending'])} jobs to push, README "
+                  f"{'behind' if self.state['readme_stale'] else 'current'}")
+
+    def save_state(self):
+        with self.lock:
+            data = json.dumps(self.state).encode()
+        write_atomic(self.state_path, data)
+
+    def update(self, **changes):
+        with self.lock:
+            self.state.update(changes)
+
+    # One poll
+
+    def poll(self):
+        """Fetch; on a change record it, then push and render. Returns whether upstream changed."""
+        rows, delta = scraper.fetch_listings_delta(self.args.url, self.args.cache_dir)
+        changed = not delta["not_modified"] and any(delta[k] for k in ("added", "changed", "removed"))
+        with self.lock:
+            self.state["polls"] += 1
+            self.state["last_poll"] = int(time.time())
+        if changed or self.listings is None:
+            self.listings = list(rows)
+            metrics.count("watch.listings_loaded", len(self.listings))
+        if changed:
+            print(f"Upstream changed: +{len(delta['added'])} ~{len(delta['changed'])} -{len(delta['removed'])}")
+            stats = self.store.apply_scrape(self.listings)
+            SearchIndex.build(self.listings, source=os.path.abspath(self.raw_path)).save(indexPath(self.raw_path))
+            jobs = self.select_jobs(delta["added"] + delta["changed"])
+            with self.lock:
+                self.state["changes"] += 1
+                self.state["last_change"] = self.state["last_poll"]
+                self.state["pending"] = _merge_jobs(self.state["pending"], jobs)
+                self.state["readme_stale"] = bool(self.args.readme)
+            # Checkpoint before the slow part so a crash here loses nothing
+            self.save_state()
+            print(f"Store: {stats['inserted']} new, {stats['updated']} updated; {len(jobs)} jobs to push")
+        self.push()
+        self.render()
+        return changed
+
+    def select_jobs(self, rows):
+        """[company, url, role] for the rows matching --push (none without it)."""
+        if not self.args.push or not rows:
+            return []
+        index = SearchIndex.build(rows)
+        matches = index.search(self.args.push)
+        return [[doc[0], doc[2], doc[1]] for doc in map(index.docs.__getitem__, matches)]
+
+    def push(self):
+        pending = self.state["pending"]
+        if not pending:
+            return
+        if self.notion is None:
+            import write_to_notion
+            self.notion = write_to_notion
+        # get_index() reconciles when it first loads the index; later pushes
+        # catch up on the pages edited since the last one
+        reconciled = self.notion._index is None
+        index = self.notion.get_index()
+        if not reconciled:
+            index.reconcile(self.notion.NOTION_DB_ID)
+        results, stats = self.notion.upsert_jobs([tuple(job) for job in pending], self.args.workers, self.args.rate)
+        self.notion.print_upsert_summary(results, stats)
+        failed = [list(job) for job, action, _, _ in results if action == "failed"]
+        with self.lock:
+            self.state["pending"] = failed
+            self.state["pushed"] += len(results) - len(failed)
+        self.save_state()
+
+    def render(self):
+        if not self.state["readme_stale"] or not self.args.readme:
+            return
+        validator = util.SchemaValidator()
+        listings = [dict(l) for l in validator.filter(self.listings)]
+        if validator.invalid:
+            print(validator.report())
+        if self.args.off_season:
+            listings = util.filterOffSeason(listings)
+        else:
+            listings = util.filterSummer(listings, self.args.year, 0)
+        util.sortListings(listings)
+        util.embedTable(listings, self.args.readme, self.args.off_season, self.args.render_cache)
+        self.update(readme_stale=False)
+        self.save_state()
+
+    # Main loop
+
+    def next_delay(self):
+        jitter = self.args.interval * self.args.jitter
+        return max(1.0, self.args.interval + random.uniform(-jitter, jitter))
+
+    def run(self):
+        self.load_state()
+        while not self.stopping.is_set():
+            try:
+                with metrics.timer("watch.poll"):
+                    self.poll()
+                self.update(last_error=None)
+            except Exception as e:
+                print(f"Poll failed: {e!r}", file=sys.stderr)
+                with self.lock:
+                    self.state["failed_polls"] += 1
+                    self.state["last_error"] = f"{type(e).__name__}: {e}"
+            self.save_state()
+            if self.args.once:
+                break
+            self.stopping.wait(self.next_delay())
+        self.close()
+
+    def stop(self, *_):
+        self.stopping.set()
+
+    def close(self):
+        if self.notion is not None and self.notion._index is not None:
+            self.notion._index.save()
+        self.store.close()
+        self.save_state()
+
+    def snapshot(self):
+        with self.lock:
+            state = dict(self.state, pending=len(self.state["pending"]))
+        state["listings"] = len(self.listings) if self.listings is not None else None
+        return state
+
+def serve_health(watcher, port):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path == "/health":
+                state = watcher.snapshot()
+                status = 503 if state["last_error"] else 200
+                body = {"ok": status == 200, **state}
+            elif self.path == "/metrics":
+                status, body = 200, {"watch": watcher.snapshot(), **metrics.summary()}
+            else:
+                status, body = 404, {"error": f"no route {self.path}"}
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def _merge_jobs(pending, jobs):
+    """pending with jobs added; a later job for the same URL replaces the earlier one."""
+    merged = {job[1]: job for job in pending}
+    merged.update((job[1], job) for job in jobs)
+    return list(merged.values())
+
+def main():
+    parser = argparse.ArgumentParser(description="Poll the upstream listings and keep the store, Notion and README current.")
+    parser.add_argument("--url", default=scraper.RAW_URL, help="Listings JSON to poll")
+    parser.add_argument("--interval", type=float, default=300, help="Seconds between polls")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Randomize each interval by up to this fraction")
+    parser.add_argument("--cache-dir", default=scraper.CACHE_DIR, help="Fetch cache and checkpoint directory")
+    parser.add_argument("--db", default=DEFAULT_DB, help="Listings store to apply scrapes to")
+    parser.add_argument("--push", metavar="QUERY",
+                        help='Upsert new/changed listings matching this search_index query into Notion, e.g. "quant AND active"')
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent Notion requests")
+    parser.add_argument("--rate", type=float, default=3.0, help="Max Notion requests per second")
+    parser.add_argument("--readme", default="README.md", help='README to regenerate on changes ("" to skip)')
+    parser.add_argument("--off-season", action="store_true", help="Render Fall/Winter/Spring roles instead of Summer")
+    parser.add_argument("--year", default="2026", help="Summer term to include")
+    parser.add_argument("--render-cache", default=os.path.join(scraper.CACHE_DIR, "readme_render.json"),
+                        help="Incremental render cache file")
+    parser.add_argument("--port", type=int, default=8787, help="Health/metrics port on 127.0.0.1 (0 to disable)")
+    parser.add_argument("--once", action="store_true", help="Run a single poll and exit")
+    args = parser.parse_args()
+
+    watcher = Watcher(args)
+    signal.signal(signal.SIGINT, watcher.stop)
+    signal.signal(signal.SIGTERM, watcher.stop)
+    server = serve_health(watcher, args.port) if args.port else None
+    if server:
+        print(f"Health on http://127.0.0.1:{server.server_address[1]}/health")
+    try:
+        watcher.run()
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+    print(f"Stopped after {watcher.state['polls']} polls, {watcher.state['changes']} changes")
+
+if __name__ == "__main__":
+    main()
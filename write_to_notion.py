@@ -1,10 +1,22 @@
 #!/usr/bin/env python3
 import os
 import sys
+import json
+import time
+import random
 import argparse
+import threading
+import contextlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from dotenv import load_dotenv
-from notion_client import Client
+from notion_client import Client, APIResponseError, APIErrorCode
+
+import metrics
+from jsonstream import iter_file
+from atomicfile import atomic_open
+from canonical_url import canonical_url, posting_key
+from listings_store import is_store
 
 # ==== CONFIG: property names in your Notion DB ====
 NAME_PROP        = "Name"          # Title
@@ -12,25 +24,53 @@ ROLE_PROP        = "Role"          # Rich text
 DATE_APPLIED_PROP= "Date Applied"  # Date
 STATUS_PROP      = "Status"        # Status
 STATUS_APPLIED   = "Applied"       # Status option
+URL_KEY_PROP     = "URL Key"       # Rich text, hidden: canonical_url.posting_key (lookup=property)
 # ==================================================
 
-load_dotenv()
-NOTION_TOKEN = os.getenv("NOTION_TOKEN")
-NOTION_DB_ID = os.getenv("NOTION_DB_ID")
+# How upsert_job finds an existing page for a URL:
+#   "index"    - local URL -> page ID index, reconciled incrementally
+#   "property" - one databases.query filtered on URL_KEY_PROP (run --backfill-url-key once first)
+LOOKUP = os.getenv("NOTION_LOOKUP", "index")
+
+# Local URL -> page ID index, so upserts don't rescan the whole database
+INDEX_PATH = os.getenv("NOTION_INDEX_PATH", ".notion_index.json")
+
+# Queries never return trashed pages, so the incremental reconcile can't see
+# deletions; a full rescan this often prunes them from the index
+FULL_RECONCILE_HOURS = float(os.getenv("NOTION_FULL_RECONCILE_HOURS", "24"))
+
+# Notion allows an average of 3 requests/second per integration
+NOTION_RATE_LIMIT = 3.0
+MAX_RETRIES = 5
+
+# Read from the environment / .env by load_settings() on first use, so
+# importing this module has no side effects
+NOTION_TOKEN = None
+NOTION_DB_ID = None
 
-if not NOTION_TOKEN or not NOTION_DB_ID:
-    print("ERROR: set NOTION_TOKEN and NOTION_DB_ID in your .env", file=sys.stderr)
-    sys.exit(1)
+notion = None  # Client shared by every call, built by get_client()
 
-notion = Client(auth=NOTION_TOKEN)
+def load_settings():
+    """Fill NOTION_TOKEN and NOTION_DB_ID from the environment and .env if unset."""
+    global NOTION_TOKEN, NOTION_DB_ID
+    if not NOTION_TOKEN or not NOTION_DB_ID:
+        from dotenv import load_dotenv
+        load_dotenv()
+        NOTION_TOKEN = NOTION_TOKEN or os.getenv("NOTION_TOKEN")
+        NOTION_DB_ID = NOTION_DB_ID or os.getenv("NOTION_DB_ID")
+    if not NOTION_TOKEN or not NOTION_DB_ID:
+        raise RuntimeError("set NOTION_TOKEN and NOTION_DB_ID in your .env")
+    return NOTION_TOKEN, NOTION_DB_ID
+
+def get_client() -> Client:
+    """The shared Notion client, created on first use."""
+    global notion
+    if notion is None:
+        notion = Client(auth=load_settings()[0])
+    return notion
 
 def _normalize_url(u: str) -> str:
-    u = (u or "").strip()
-    if not u:
-        return u
-    if not u.startswith(("http://", "https://")):
-        u = "https://" + u
-    return u
+    return canonical_url(u)
 
 def _extract_title_link(page) -> str:
     """Return the URL linked in the Title (Name) property, if any."""
@@ -44,6 +84,21 @@ def _extract_title_link(page) -> str:
             return link["url"].strip()
     return ""
 
+def _page_gone(e: APIResponseError) -> bool:
+    """Whether an update failed because the page was deleted or moved to the trash."""
+    if e.code == APIErrorCode.ObjectNotFound:
+        return True
+    # Notion answers edits to a trashed page with 400 validation_error, not 404
+    return e.code == APIErrorCode.ValidationError and "archived" in str(e)
+
+def _page_details(page):
+    """[status, date applied, last_edited_time] of a page, as kept in PageIndex."""
+    props = page.get("properties", {})
+    status = props.get(STATUS_PROP, {})
+    status = (status.get("select") or status.get("status") or {}).get("name")
+    applied = (props.get(DATE_APPLIED_PROP, {}).get("date") or {}).get("start")
+    return [status, applied, page.get("last_edited_time")]
+
 def find_page_by_url_from_title_link(db_id: str, url: str):
     """
     Iterate the database and find a page whose Name (Title) has a hyperlink equal to url.
@@ -52,7 +107,8 @@ def find_page_by_url_from_title_link(db_id: str, url: str):
     cursor = None
     target = _normalize_url(url)
     while True:
-        resp = notion.databases.query(
+        resp = call_notion(
+            get_client().databases.query,
             database_id=db_id,
             page_size=100,
             start_cursor=cursor
@@ -66,17 +122,252 @@ def find_page_by_url_from_title_link(db_id: str, url: str):
         cursor = resp.get("next_cursor")
     return None
 
-def upsert_job(company: str, url: str, role: str):
-    today_str = date.today().isoformat()
-    url = _normalize_url(url)
+def find_page_by_url_key(db_id: str, url: str):
+    """Find the page whose URL_KEY_PROP matches url's posting key with one filtered query."""
+    resp = call_notion(
+        get_client().databases.query,
+        database_id=db_id,
+        page_size=1,
+        filter={"property": URL_KEY_PROP, "rich_text": {"equals": posting_key(url)}},
+    )
+    results = resp.get("results", [])
+    return results[0] if results else None
+
+def backfill_url_key(db_id: str, workers: int = 4, rate: float = NOTION_RATE_LIMIT):
+    """
+    One-time migration for LOOKUP = "property": add URL_KEY_PROP to the
+    database and set it from each page's title link. Only pages whose key is
+    missing or out of date are written, so an interrupted backfill can
+    simply be re-run. Returns (updated, skipped) counts.
+    """
+    global _limiter
+    _limiter = TokenBucket(rate)
+    call_notion(get_client().databases.update, database_id=db_id, properties={URL_KEY_PROP: {"rich_text": {}}})
+
+    # Collect first, then write, so the writes can't shift the query cursor
+    todo, skipped, cursor = [], 0, None
+    while True:
+        resp = call_notion(
+            get_client().databases.query,
+            database_id=db_id,
+            page_size=100,
+            start_cursor=cursor,
+        )
+        for page in resp.get("results", []):
+            url = _extract_title_link(page)
+            key = page["properties"].get(URL_KEY_PROP, {}).get("rich_text", [])
+            if not url:
+                skipped += 1
+            elif "".join(t.get("plain_text", "") for t in key) != posting_key(url):
+                todo.append((page["id"], url))
+        if not resp.get("has_more"):
+            break
+        cursor = resp.get("next_cursor")
+
+    def run(item):
+        page_id, url = item
+        call_notion(get_client().pages.update, page_id=page_id, properties={URL_KEY_PROP: _url_key(url)})
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        list(pool.map(run, todo))
+    return len(todo), skipped
+
+class PageIndex:
+    """
+    Persistent snapshot of one tracker database: posting key of the title
+    link (see canonical_url.py) -> page ID, plus each page's status, date applied and last_edited_time.
+    The first reconcile() pages through the whole database; later ones only
+    query pages whose last_edited_time is on or after the newest one seen.
+    Every FULL_RECONCILE_HOURS the whole database is read again and pages
+    it no longer returns (deleted or trashed) are dropped.
+    """
+    VERSION = 4  # 4: posting keys of root URLs end in "/"
+
+    def __init__(self, path: str = INDEX_PATH):
+        self.path = path
+        self.db_id = None
+        self.synced_at = None  # newest last_edited_time seen (ISO 8601)
+        self.full_at = None    # epoch time of the last full reconcile
+        self.scanned = None    # page ids seen by a full reconcile in progress
+        self.urls = {}         # posting key -> page id
+        self.pages = {}        # page id -> posting key
+        self.details = {}      # page id -> [status, date applied, last_edited_time]
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            data = json.load(f)
+        if data.get("version") != self.VERSION:
+            return
+        self.db_id = data.get("db_id")
+        self.synced_at = data.get("synced_at")
+        self.full_at = data.get("full_at")
+        for page_id, (url, *details) in data.get("pages", {}).items():
+            self.urls[url] = page_id
+            self.pages[page_id] = url
+            self.details[page_id] = details
+
+    def save(self):
+        if not self.path:
+            return
+        with atomic_open(self.path) as f:
+            json.dump({
+                "version": self.VERSION,
+                "db_id": self.db_id,
+                "synced_at": self.synced_at,
+                "full_at": self.full_at,
+                "pages": {page_id: [url, *self.details.get(page_id, (None, None, None))]
+                          for page_id, url in self.pages.items()},
+            }, f)
+
+    def get(self, url: str):
+        return self.urls.get(posting_key(url))
+
+    def put(self, url: str, page_id: str, details=None):
+        self.discard(page_id)
+        url = posting_key(url)
+        if url:
+            self.urls[url] = page_id
+            self.pages[page_id] = url
+            if details is not None:
+                self.details[page_id] = details
+
+    def discard(self, page_id: str):
+        url = self.pages.pop(page_id, None)
+        self.details.pop(page_id, None)
+        if url is not None and self.urls.get(url) == page_id:
+            del self.urls[url]
+
+    def status(self, url: str):
+        """Tracker status of the page for url, or None if it is not tracked."""
+        page_id = self.get(url)
+        return self.details.get(page_id, [None])[0] if page_id else None
+
+    def apply_page(self, page):
+        """Fold one page from a query response into the index."""
+        if page.get("archived") or page.get("in_trash"):
+            self.discard(page["id"])
+        else:
+            self.put(_extract_title_link(page), page["id"], _page_details(page))
+            if self.scanned is not None:
+                self.scanned.add(page["id"])
+        edited = page.get("last_edited_time")
+        if edited and (self.synced_at is None or edited > self.synced_at):
+            self.synced_at = edited
+
+    def reconcile_query(self, db_id: str):
+        """
+        Query arguments for the pages edited since the last reconcile, or for
+        all pages on first use and once the last full reconcile is
+        FULL_RECONCILE_HOURS old. Call finish_reconcile() after applying them.
+        """
+        if db_id != self.db_id:
+            self.db_id, self.synced_at, self.full_at = db_id, None, None
+            self.urls, self.pages, self.details = {}, {}, {}
+        query = {"database_id": db_id, "page_size": 100}
+        if self.full_at is None or time.time() - self.full_at >= FULL_RECONCILE_HOURS * 3600:
+            self.scanned = set()
+        elif self.synced_at:
+            # last_edited_time is minute-granular, so re-read the boundary minute
+            query["filter"] = {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": self.synced_at},
+            }
+        return query
 
-    # Build properties payload
+    def reconcile(self, db_id: str):
+        """Bring the index up to date with the database and persist it."""
+        query = self.reconcile_query(db_id)
+        cursor = None
+        while True:
+            resp = call_notion(get_client().databases.query, start_cursor=cursor, **query)
+            for page in resp.get("results", []):
+                self.apply_page(page)
+            if not resp.get("has_more"):
+                break
+            cursor = resp.get("next_cursor")
+        self.finish_reconcile()
+        self.save()
+
+    def finish_reconcile(self):
+        """After a full reconcile, drop the pages the database no longer returned."""
+        if self.scanned is None:
+            return
+        for page_id in [page_id for page_id in self.pages if page_id not in self.scanned]:
+            self.discard(page_id)
+        self.scanned = None
+        self.full_at = time.time()
+
+class TokenBucket:
+    """Thread-safe token bucket: acquire() blocks until a request may be sent."""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+_limiter = None  # TokenBucket shared by all calls, set in bulk mode
+retry_count = 0  # 429 retries made by call_notion in this process
+
+def call_notion(fn, **kwargs):
+    """Call a Notion endpoint, honoring the rate limiter and retrying 429s with backoff."""
+    global retry_count
+    name = f"notion.{getattr(fn, '__qualname__', 'call')}"
+    for attempt in range(MAX_RETRIES + 1):
+        if _limiter:
+            _limiter.acquire()
+        metrics.count("notion.calls")
+        try:
+            with metrics.timer(name):
+                return fn(**kwargs)
+        except APIResponseError as e:
+            if e.status != 429 or attempt == MAX_RETRIES:
+                metrics.count("notion.errors")
+                raise
+            retry_after = e.headers.get("retry-after") if e.headers else None
+            delay = float(retry_after) if retry_after else 2 ** attempt
+            retry_count += 1
+            metrics.count("notion.retries")
+            time.sleep(delay + random.uniform(0, 0.5))
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_index() -> PageIndex:
+    """Load the local index and reconcile it once per process."""
+    global _index
+    if _index is None:
+        load_settings()
+        _index = PageIndex()
+        _index.reconcile(NOTION_DB_ID)
+    return _index
+
+def _url_key(url: str):
+    return {"rich_text": [{"type": "text", "text": {"content": posting_key(url)}}]}
+
+def build_props(company: str, url: str, role: str):
+    today_str = date.today().isoformat()
     props = {
         NAME_PROP: {
             "title": [{
                 "type": "text",
-                "text": {"content": company},
-                "href": url,
+                "text": {"content": company, "link": {"url": url}},
             }]
         },
         ROLE_PROP: {
@@ -88,26 +379,216 @@ def upsert_job(company: str, url: str, role: str):
         DATE_APPLIED_PROP: {"date": {"start": today_str}},
         STATUS_PROP: {"select": {"name": STATUS_APPLIED}},  # <-- changed from "status" to "select"
     }
+    if LOOKUP == "property":
+        props[URL_KEY_PROP] = _url_key(url)
+    return props
+
+def upsert_job(company: str, url: str, role: str, save_index: bool = True):
+    load_settings()
+    url = _normalize_url(url)
+    props = build_props(company, url, role)
+
+    if LOOKUP == "property":
+        page = find_page_by_url_key(NOTION_DB_ID, url)
+        if page:
+            call_notion(get_client().pages.update, page_id=page["id"], properties=props)
+            return ("updated", page["id"])
+        new_page = call_notion(get_client().pages.create, parent={"database_id": NOTION_DB_ID}, properties=props)
+        return ("created", new_page["id"])
+
+    index = get_index()
+    page_id = index.get(url)
+    metrics.count("notion.index_hits" if page_id else "notion.index_misses")
+    if page_id:
+        try:
+            call_notion(get_client().pages.update, page_id=page_id, properties=props)
+            return ("updated", page_id)
+        except APIResponseError as e:
+            # Deleted or trashed since the last full scan; fall through and recreate it
+            if not _page_gone(e):
+                raise
+            with _index_lock:
+                index.discard(page_id)
+
+    new_page = call_notion(
+        get_client().pages.create,
+        parent={"database_id": NOTION_DB_ID},
+        properties=props
+    )
+    with _index_lock:
+        index.put(url, new_page["id"], _page_details(new_page))
+        if save_index:
+            index.save()
+    return ("created", new_page["id"])
+
+def iter_not_applied(listings, index: PageIndex, include_inactive: bool = False):
+    """Listings whose normalized URL has no page in the tracker snapshot."""
+    tracked = index.urls
+    for listing in listings:
+        if not include_inactive and not listing.get("active", True):
+            continue
+        if posting_key(listing.get("url")) not in tracked:
+            yield listing
 
-    existing = find_page_by_url_from_title_link(NOTION_DB_ID, url)
-    if existing:
-        page_id = existing["id"]
-        notion.pages.update(page_id=page_id, properties=props)
-        return ("updated", page_id)
+def read_jobs(path: str):
+    """
+    Read jobs from a JSON array (e.g. scraper.py --json's listings.json) or
+    JSONL, from a file or "-" for stdin, or from the latest scrape in a
+    listings store (.db). Accepts either company/url/role keys or the
+    listing keys company_name/url/title. Later rows for the same posting
+    (see canonical_url.posting_key) win.
+    """
+    if is_store(path):
+        from listings_store import ListingStore
+        with ListingStore(path, create=False) as store:
+            rows = list(store.iter_listings())
     else:
-        new_page = notion.pages.create(
-            parent={"database_id": NOTION_DB_ID},
-            properties=props
+        if path == "-":
+            text = sys.stdin.read()
+        else:
+            with open(path) as f:
+                text = f.read()
+        text = text.strip()
+        if text.startswith("["):
+            rows = json.loads(text)
+        else:
+            rows = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    jobs = {}
+    for r in rows:
+        company = (r.get("company") or r.get("company_name") or "").strip()
+        url = _normalize_url(r.get("url") or "")
+        role = (r.get("role") or r.get("title") or "").strip()
+        if company and url:
+            jobs[posting_key(url)] = (company, url, role)
+    return list(jobs.values())
+
+@metrics.timed("notion.upsert_jobs")
+def upsert_jobs(jobs, workers: int = 4, rate: float = NOTION_RATE_LIMIT):
+    """
+    Upsert many (company, url, role) jobs through a bounded thread pool that
+    shares one client and one rate limiter. Returns (results, stats).
+    """
+    global _limiter
+    _limiter = TokenBucket(rate)
+    retries_before = retry_count
+
+    start = time.perf_counter()
+    index = get_index() if LOOKUP == "index" else None
+    if index is not None:
+        creates = [job for job in jobs if not index.get(job[1])]
+        print(f"{len(jobs)} jobs: {len(jobs) - len(creates)} updates, {len(creates)} creates")
+
+    def run(job):
+        t0 = time.perf_counter()
+        try:
+            action, page_id = upsert_job(*job, save_index=False)
+        except Exception as e:
+            action, page_id = "failed", str(e)
+        return job, action, page_id, time.perf_counter() - t0
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            results = list(pool.map(run, jobs))
+    finally:
+        if index is not None:
+            index.save()
+
+    return results, upsert_stats(results, time.perf_counter() - start, retry_count - retries_before)
+
+def upsert_stats(results, elapsed: float, retries: int):
+    """Counts, throughput and latency percentiles for (job, action, detail, seconds) results."""
+    latencies = sorted(r[3] for r in results)
+    stats = {"retries": retries}
+    for action in ("created", "updated", "failed"):
+        stats[action] = sum(1 for r in results if r[1] == action)
+    stats["elapsed_s"] = elapsed
+    stats["jobs_per_s"] = len(results) / elapsed if elapsed else 0.0
+    if latencies:
+        stats["latency_p50_s"] = latencies[len(latencies) // 2]
+        stats["latency_p95_s"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        stats["latency_max_s"] = latencies[-1]
+    return stats
+
+def print_upsert_summary(results, stats):
+    for (company, url, _), action, detail, _ in results:
+        if action == "failed":
+            print(f"FAILED {company} {url}: {detail}", file=sys.stderr)
+    print(
+        f"Synced {len(results)} jobs in {stats['elapsed_s']:.1f}s "
+        f"({stats['jobs_per_s']:.2f} jobs/s): {stats['created']} created, "
+        f"{stats['updated']} updated, {stats['failed']} failed, {stats['retries']} retries"
+    )
+    if results:
+        print(
+            f"Latency p50 {stats['latency_p50_s']:.2f}s, "
+            f"p95 {stats['latency_p95_s']:.2f}s, max {stats['latency_max_s']:.2f}s"
         )
-        return ("created", new_page["id"])
 
 def main():
+    global LOOKUP
     parser = argparse.ArgumentParser(description="Add/update a job in Notion. Dedupe by hyperlink on Name.")
-    parser.add_argument("--company", required=True, help="Company name (will be the Title text)")
-    parser.add_argument("--url", required=True, help="Job URL (used as the hyperlink on Title)")
-    parser.add_argument("--role", required=True, help="Role description/title")
+    parser.add_argument("--company", help="Company name (will be the Title text)")
+    parser.add_argument("--url", help="Job URL (used as the hyperlink on Title)")
+    parser.add_argument("--role", help="Role description/title")
+    parser.add_argument("--file", help="Bulk mode: JSON array or JSONL of jobs ('-' for stdin), or a listings store (.db)")
+    parser.add_argument("--workers", type=int, default=4, help="Bulk mode: concurrent requests")
+    parser.add_argument("--rate", type=float, default=NOTION_RATE_LIMIT, help="Bulk mode: max requests per second")
+    parser.add_argument("--lookup", choices=("index", "property"), default=LOOKUP,
+                        help=f"Find existing pages via the local index or the {URL_KEY_PROP!r} property")
+    parser.add_argument("--export", action="store_true",
+                        help=f"Refresh the local tracker snapshot ({INDEX_PATH}) and exit")
+    parser.add_argument("--not-applied", metavar="LISTINGS",
+                        help="Print listings from this JSON file or listings store (.db) that are not in the tracker yet, as JSONL")
+    parser.add_argument("--include-inactive", action="store_true", help="With --not-applied, keep inactive listings")
+    parser.add_argument("--backfill-url-key", action="store_true",
+                        help=f"Add {URL_KEY_PROP!r} to the database and fill it from title links, then exit")
     args = parser.parse_args()
 
+    LOOKUP = args.lookup
+    for path in (args.not_applied, args.file):
+        # Checked before the tracker is fetched; a missing store would otherwise be created empty
+        if path and path != "-" and not os.path.exists(path):
+            sys.exit(f"ERROR: {path} does not exist")
+    try:
+        load_settings()
+    except RuntimeError as e:
+        sys.exit(f"ERROR: {e}")
+
+    if args.export or args.not_applied:
+        index = get_index()
+        statuses = Counter(status or "no status" for status, _, _ in index.details.values())
+        print(f"Tracker snapshot: {len(index.urls)} pages, synced to {index.synced_at} "
+              f"({', '.join(f'{n} {s}' for s, n in statuses.most_common())})", file=sys.stderr)
+        if args.not_applied:
+            start = time.perf_counter()
+            count = 0
+            with contextlib.ExitStack() as stack:
+                if is_store(args.not_applied):
+                    # Only the latest scrape's (active) rows are read, through the store's indexes
+                    from listings_store import ListingStore
+                    store = stack.enter_context(ListingStore(args.not_applied, create=False))
+                    listings = store.iter_listings(active=None if args.include_inactive else True)
+                else:
+                    listings = iter_file(args.not_applied)
+                for listing in iter_not_applied(listings, index, args.include_inactive):
+                    print(json.dumps(listing))
+                    count += 1
+            print(f"{count} listings not applied to ({(time.perf_counter() - start) * 1000:.0f} ms)", file=sys.stderr)
+        return
+
+    if args.backfill_url_key:
+        updated, skipped = backfill_url_key(NOTION_DB_ID, args.workers, args.rate)
+        print(f"Backfilled {URL_KEY_PROP!r} on {updated} pages ({skipped} without a title link)")
+        return
+
+    if args.file:
+        results, stats = upsert_jobs(read_jobs(args.file), args.workers, args.rate)
+        print_upsert_summary(results, stats)
+        return
+
+    if not (args.company and args.url and args.role):
+        parser.error("--company, --url and --role are required unless --file is given")
     action, page_id = upsert_job(args.company.strip(), args.url.strip(), args.role.strip())
     print(f"Successfully {action} page: {page_id}")
 